@@ -19,7 +19,8 @@ from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
-_FEEDBACK_FILE_ENV = "ROUTER_FEEDBACK_FILE"
+# Separate from FeedbackStore's ROUTER_FEEDBACK_FILE: the two stores' files are not compatible
+_FEEDBACK_FILE_ENV = "ROUTER_CACHED_FEEDBACK_FILE"
 _DEFAULT_FEEDBACK_FILE = str(Path(gettempdir()) / "tool_router_feedback.json")
 _MAX_ENTRIES = 1000
 
@@ -84,6 +85,11 @@ class CachedFeedbackStore:
     Feedback is used to boost or penalise tools based on historical success
     rates, providing a lightweight learning signal without requiring a full
     ML pipeline.
+
+    Only the JSON snapshot is read and rewritten; the ``<file>.log`` journal kept by
+    :class:`~tool_router.ai.feedback.FeedbackStore` is not replayed, so do not point
+    both stores at the same file. By default they use different files and different
+    environment variables (``ROUTER_CACHED_FEEDBACK_FILE`` here).
     """
 
     def __init__(
@@ -4,18 +4,72 @@ import json
 import logging
 import os
 import re
+import secrets
 import time
+from collections import Counter, deque
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from tempfile import gettempdir
 from typing import Any
 
+from cachetools import LRUCache
+
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
+
+def _dump_line(obj: dict[str, Any]) -> bytes:
+    """Serialize one journal record as a newline-terminated compact JSON line."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+def _load_line(line: bytes) -> dict[str, Any]:
+    return orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+
+
 _FEEDBACK_FILE_ENV = "ROUTER_FEEDBACK_FILE"
-_DEFAULT_FEEDBACK_FILE = str(Path(gettempdir()) / "tool_router_feedback.json")
+# Not shared with CachedFeedbackStore, which would drop this store's journal
+_DEFAULT_FEEDBACK_FILE = str(Path(gettempdir()) / "tool_router_feedback_store.json")
 _MAX_ENTRIES = 1000
+_SIMILAR_CACHE_SIZE = 512
+_RECENT_WINDOW = 50
+
+
+def _keyword_pattern(*keywords: str) -> re.Pattern[str]:
+    """Compile keywords into one alternation that matches any of them as a substring."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+# Classification rules in priority order: the first category with a keyword
+# anywhere in the lowercased task wins.
+_TASK_TYPE_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("file_operations", _keyword_pattern("file", "read", "write", "create", "delete", "open")),
+    ("search_operations", _keyword_pattern("search", "find", "lookup", "query")),
+    ("code_operations", _keyword_pattern("code", "edit", "modify", "refactor", "syntax")),
+    ("database_operations", _keyword_pattern("database", "db", "sql", "query", "table")),
+    ("network_operations", _keyword_pattern("http", "api", "request", "fetch", "web")),
+    ("system_operations", _keyword_pattern("system", "process", "command", "terminal", "shell")),
+)
+
+_INTENT_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("create", _keyword_pattern("create", "make", "add", "new", "generate", "build")),
+    ("read", _keyword_pattern("read", "get", "fetch", "retrieve", "show", "display", "list")),
+    ("update", _keyword_pattern("update", "modify", "change", "edit", "alter", "adjust")),
+    ("delete", _keyword_pattern("delete", "remove", "destroy", "clear", "clean")),
+    ("search", _keyword_pattern("search", "find", "lookup", "query", "seek")),
+)
 
 
 @dataclass
@@ -80,69 +134,68 @@ class FeedbackStore:
     ML pipeline.
     """
 
-    def __init__(self, feedback_file: str | None = None) -> None:
+    def __init__(self, feedback_file: str | None = None, persist: bool = True) -> None:
+        """Create a feedback store.
+
+        Args:
+            feedback_file: JSON snapshot file backing the store; defaults to
+                ``ROUTER_FEEDBACK_FILE`` or a file in the system temp directory. New entries
+                are appended to a ``<feedback_file>.log`` journal and only reach the snapshot
+                when the journal is compacted, every _MAX_ENTRIES lines or on
+                :meth:`compact`; readers of the snapshot alone may lag behind.
+            persist: When False the store is purely in-memory: nothing is loaded from or
+                written to ``feedback_file``.
+        """
         self._file = Path(feedback_file or os.getenv(_FEEDBACK_FILE_ENV, _DEFAULT_FEEDBACK_FILE))
+        self._persist_enabled = persist
         self._entries: list[FeedbackEntry] = []
         self._stats: dict[str, ToolStats] = {}
         self._patterns: dict[str, TaskPattern] = {}
-        self._load()
+        # Per-tool [sum, compensation, count] of confidences over the retained entries,
+        # kept with Neumaier summation so averages stay exact as entries enter and leave.
+        self._confidence_sums: dict[str, list[float]] = {}
+        # Sliding window of the last _RECENT_WINDOW (tool, success) outcomes with running
+        # per-tool counts, so recent_success_rate updates in O(1).
+        self._recent: deque[tuple[str, bool]] = deque()
+        self._recent_counts: dict[str, list[int]] = {}
+        # Running aggregates over the retained entries, so pattern and intent rates are O(1)
+        # instead of rescanning the history. Keys: (task_type, tool), task_type and
+        # (tool, intent_category).
+        self._pattern_totals: Counter[tuple[str, str]] = Counter()
+        self._pattern_successes: Counter[tuple[str, str]] = Counter()
+        self._type_totals: Counter[str] = Counter()
+        self._type_confidence: Counter[str] = Counter()
+        self._intent_totals: Counter[tuple[str, str]] = Counter()
+        self._intent_successes: Counter[tuple[str, str]] = Counter()
+        # similar_task_tools results keyed by (task token set, top_n); cleared on every record.
+        self._similar_cache: LRUCache = LRUCache(maxsize=_SIMILAR_CACHE_SIZE)
+        # Persistence is a JSON snapshot (``feedback_file``) plus an append-only NDJSON
+        # journal next to it holding entries recorded since the last compaction. Each
+        # journal opens with a {"journal_id": ...} header; compaction records that id in
+        # the snapshot so a journal left behind by a crash is not replayed twice.
+        self._journal_file = self._file.with_name(self._file.name + ".log")
+        self._journal_id: str | None = None
+        self._journal_lines = 0
+        self._unsaved: list[FeedbackEntry] = []
+        if self._persist_enabled:
+            self._load()
 
     @staticmethod
     def _classify_task_type(task: str) -> str:
         """Classify task into semantic categories."""
         task_lower = task.lower()
-
-        # File operations
-        if any(word in task_lower for word in ["file", "read", "write", "create", "delete", "open"]):
-            return "file_operations"
-
-        # Search operations
-        if any(word in task_lower for word in ["search", "find", "lookup", "query", "search"]):
-            return "search_operations"
-
-        # Code operations
-        if any(word in task_lower for word in ["code", "edit", "modify", "refactor", "syntax"]):
-            return "code_operations"
-
-        # Database operations
-        if any(word in task_lower for word in ["database", "db", "sql", "query", "table"]):
-            return "database_operations"
-
-        # Network operations
-        if any(word in task_lower for word in ["http", "api", "request", "fetch", "web"]):
-            return "network_operations"
-
-        # System operations
-        if any(word in task_lower for word in ["system", "process", "command", "terminal", "shell"]):
-            return "system_operations"
-
+        for task_type, pattern in _TASK_TYPE_PATTERNS:
+            if pattern.search(task_lower):
+                return task_type
         return "general_operations"
 
     @staticmethod
     def _classify_intent(task: str) -> str:
         """Classify user intent."""
         task_lower = task.lower()
-
-        # Create intent
-        if any(word in task_lower for word in ["create", "make", "add", "new", "generate", "build"]):
-            return "create"
-
-        # Read intent
-        if any(word in task_lower for word in ["read", "get", "fetch", "retrieve", "show", "display", "list"]):
-            return "read"
-
-        # Update intent
-        if any(word in task_lower for word in ["update", "modify", "change", "edit", "alter", "adjust"]):
-            return "update"
-
-        # Delete intent
-        if any(word in task_lower for word in ["delete", "remove", "destroy", "clear", "clean"]):
-            return "delete"
-
-        # Search intent
-        if any(word in task_lower for word in ["search", "find", "lookup", "query", "seek"]):
-            return "search"
-
+        for intent, pattern in _INTENT_PATTERNS:
+            if pattern.search(task_lower):
+                return intent
         return "unknown"
 
     @staticmethod
@@ -181,37 +234,67 @@ class FeedbackStore:
         confidence: float = 0.0,
     ) -> None:
         """Record the outcome of a tool selection with enhanced learning."""
-        # Classify task for learning
-        task_type = self._classify_task_type(task)
-        intent_category = self._classify_intent(task)
-        entities = self._extract_entities(task)
-
         entry = FeedbackEntry(
             task=task,
             selected_tool=selected_tool,
             success=success,
             context=context,
             confidence=confidence,
-            task_type=task_type,
-            intent_category=intent_category,
-            entities=entities,
         )
+        stats = self._apply_entry(entry)
+        self._unsaved.append(entry)
+
+        self._persist()
+        logger.debug(
+            "Enhanced feedback recorded: tool=%s success=%s task_type=%s rate=%.2f",
+            selected_tool,
+            success,
+            entry.task_type,
+            stats.success_rate,
+        )
+
+    def record_many(self, entries: Iterable[FeedbackEntry]) -> None:
+        """Record a batch of tool selection outcomes, persisting once at the end.
+
+        Classification fields (task type, intent, entities) are derived from each
+        entry's task, exactly as :meth:`record` does for a single outcome.
+        """
+        recorded = 0
+        for entry in entries:
+            self._apply_entry(entry)
+            self._unsaved.append(entry)
+            recorded += 1
+
+        if recorded:
+            self._persist()
+            logger.debug("Enhanced feedback recorded: %d entries in batch", recorded)
+
+    def _apply_entry(self, entry: FeedbackEntry) -> ToolStats:
+        """Classify an entry and fold it into the in-memory stats and patterns."""
+        task_type = self._classify_task_type(entry.task)
+        intent_category = self._classify_intent(entry.task)
+        entities = self._extract_entities(entry.task)
+        entry.task_type = task_type
+        entry.intent_category = intent_category
+        entry.entities = entities
+
+        selected_tool = entry.selected_tool
         self._entries.append(entry)
+        self._count_entry(entry, 1)
+        self._similar_cache.clear()
 
         # Update tool statistics
         if selected_tool not in self._stats:
             self._stats[selected_tool] = ToolStats(selected_tool)
         stats = self._stats[selected_tool]
-        if success:
+        if entry.success:
             stats.success_count += 1
         else:
             stats.failure_count += 1
 
-        # Update confidence tracking
-        total_entries = len([e for e in self._entries if e.selected_tool == selected_tool])
-        if total_entries > 0:
-            confidences = [e.confidence for e in self._entries if e.selected_tool == selected_tool]
-            stats.avg_confidence = sum(confidences) / len(confidences)
+        # Update confidence tracking (the entry was counted into the window above)
+        total, compensation, count = self._confidence_sums[selected_tool]
+        stats.avg_confidence = (total + compensation) / count
 
         # Update task type tracking
         if task_type not in stats.task_types:
@@ -224,10 +307,9 @@ class FeedbackStore:
         stats.intent_categories[intent_category] += 1
 
         # Update recent success rate (last 50 entries)
-        recent_entries = [e for e in self._entries[-50:] if e.selected_tool == selected_tool]
-        if recent_entries:
-            recent_successes = sum(1 for e in recent_entries if e.success)
-            stats.recent_success_rate = recent_successes / len(recent_entries)
+        self._track_recent(selected_tool, entry.success)
+        recent_total, recent_successes = self._recent_counts[selected_tool]
+        stats.recent_success_rate = recent_successes / recent_total
 
         # Update task patterns
         if task_type not in self._patterns:
@@ -235,38 +317,73 @@ class FeedbackStore:
         pattern = self._patterns[task_type]
         pattern.total_occurrences += 1
 
-        # Update pattern tool preferences
-        if selected_tool not in pattern.preferred_tools:
-            pattern.preferred_tools[selected_tool] = 0.0
-
-        # Calculate success rate for this tool in this task type
-        task_type_entries = [e for e in self._entries if e.task_type == task_type and e.selected_tool == selected_tool]
-        if task_type_entries:
-            success_rate = sum(1 for e in task_type_entries if e.success) / len(task_type_entries)
-            pattern.preferred_tools[selected_tool] = success_rate
+        # Update pattern tool preferences with this tool's success rate for the task type
+        pair = (task_type, selected_tool)
+        pattern.preferred_tools[selected_tool] = self._pattern_successes[pair] / self._pattern_totals[pair]
 
         # Update pattern entities
         for entity in entities:
             if entity not in pattern.common_entities:
                 pattern.common_entities.append(entity)
 
-        # Calculate average confidence for this task type
-        task_type_confidences = [e.confidence for e in self._entries if e.task_type == task_type]
-        if task_type_confidences:
-            pattern.avg_confidence = sum(task_type_confidences) / len(task_type_confidences)
+        # Average confidence for this task type
+        pattern.avg_confidence = self._type_confidence[task_type] / self._type_totals[task_type]
 
         # Trim to avoid unbounded growth
         if len(self._entries) > _MAX_ENTRIES:
+            for old_entry in self._entries[:-_MAX_ENTRIES]:
+                self._count_entry(old_entry, -1)
             self._entries = self._entries[-_MAX_ENTRIES:]
 
-        self._persist()
-        logger.debug(
-            "Enhanced feedback recorded: tool=%s success=%s task_type=%s rate=%.2f",
-            selected_tool,
-            success,
-            task_type,
-            stats.success_rate,
-        )
+        return stats
+
+    def _count_entry(self, entry: FeedbackEntry, delta: int) -> None:
+        """Add (delta=1) or remove (delta=-1) a retained entry from the running aggregates."""
+        pair = (entry.task_type, entry.selected_tool)
+        intent = (entry.selected_tool, entry.intent_category)
+        successes = delta if entry.success else 0
+        self._pattern_totals[pair] += delta
+        self._pattern_successes[pair] += successes
+        self._intent_totals[intent] += delta
+        self._intent_successes[intent] += successes
+        self._type_totals[entry.task_type] += delta
+        if self._type_totals[entry.task_type]:
+            self._type_confidence[entry.task_type] += delta * entry.confidence
+        else:
+            # Drop float residue once the last entry of a task type leaves the window
+            self._type_confidence[entry.task_type] = 0.0
+        self._count_confidence(entry.selected_tool, delta, entry.confidence)
+
+    def _count_confidence(self, tool_name: str, delta: int, confidence: float) -> None:
+        """Add or remove one confidence from a tool's compensated running sum."""
+        acc = self._confidence_sums.get(tool_name)
+        if acc is None:
+            acc = self._confidence_sums[tool_name] = [0.0, 0.0, 0]
+        acc[2] += delta
+        if not acc[2]:
+            del self._confidence_sums[tool_name]
+            return
+        value = delta * confidence
+        total = acc[0] + value
+        if abs(acc[0]) >= abs(value):
+            acc[1] += (acc[0] - total) + value
+        else:
+            acc[1] += (value - total) + acc[0]
+        acc[0] = total
+
+    def _track_recent(self, tool_name: str, success: bool) -> None:
+        """Slide the recent-outcomes window forward, keeping per-tool [total, successes] counts."""
+        if len(self._recent) == _RECENT_WINDOW:
+            old_tool, old_success = self._recent.popleft()
+            old_counts = self._recent_counts[old_tool]
+            old_counts[0] -= 1
+            old_counts[1] -= old_success
+            if not old_counts[0]:
+                del self._recent_counts[old_tool]
+        self._recent.append((tool_name, success))
+        counts = self._recent_counts.setdefault(tool_name, [0, 0])
+        counts[0] += 1
+        counts[1] += success
 
     def get_boost(self, tool_name: str) -> float:
         """Return an enhanced score multiplier based on comprehensive learning."""
@@ -308,14 +425,13 @@ class FeedbackStore:
         if not stats or intent_category not in stats.intent_categories:
             return 1.0
 
-        # Calculate success rate for this specific intent
-        intent_entries = [
-            e for e in self._entries if e.selected_tool == tool_name and e.intent_category == intent_category
-        ]
-        if not intent_entries:
+        # Success rate for this specific intent among retained entries
+        key = (tool_name, intent_category)
+        total = self._intent_totals[key]
+        if not total:
             return 1.0
 
-        success_rate = sum(1 for e in intent_entries if e.success) / len(intent_entries)
+        success_rate = self._intent_successes[key] / total
         return 0.8 + (success_rate * 0.4)  # Range: 0.8 to 1.2
 
     def get_comprehensive_boost(self, tool_name: str, task: str) -> float:
@@ -405,9 +521,18 @@ class FeedbackStore:
     def similar_task_tools(self, task: str, top_n: int = 3) -> list[str]:
         """Return tool names that succeeded on similar past tasks.
 
-        Uses simple token overlap as a lightweight similarity measure.
+        Uses simple token overlap as a lightweight similarity measure. Results are
+        memoized until the next recorded outcome.
         """
-        task_tokens = set(task.lower().split())
+        task_tokens = frozenset(task.lower().split())
+        cache_key = (task_tokens, top_n)
+        cached = self._similar_cache.get(cache_key)
+        if cached is None:
+            cached = self._similar_cache[cache_key] = self._compute_similar_task_tools(task_tokens, top_n)
+        return list(cached)
+
+    def _compute_similar_task_tools(self, task_tokens: frozenset[str], top_n: int) -> tuple[str, ...]:
+        """Scan successful entries for token overlap with the task."""
         candidates: list[tuple[str, float]] = []
 
         for entry in reversed(self._entries):
@@ -426,38 +551,161 @@ class FeedbackStore:
                 best[tool_name] = sim
 
         sorted_tools = sorted(best.items(), key=lambda x: -x[1])
-        return [t for t, _ in sorted_tools[:top_n]]
+        return tuple(t for t, _ in sorted_tools[:top_n])
 
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
     def _persist(self) -> None:
-        """Write entries to disk (best-effort)."""
+        """Append not-yet-saved entries to the journal (best-effort).
+
+        Each entry is one NDJSON line, so a write costs O(batch) rather than a rewrite of
+        the whole store. Once the journal reaches _MAX_ENTRIES lines it is folded into
+        the snapshot by :meth:`compact`.
+        """
+        if not self._persist_enabled:
+            self._unsaved.clear()
+            return
+        if not self._unsaved:
+            return
+        try:
+            self._file.parent.mkdir(parents=True, exist_ok=True)
+            payload = b"".join(_dump_line(asdict(e)) for e in self._unsaved)
+            journal_id = self._journal_id or secrets.token_hex(8)
+            if self._journal_id is None:
+                payload = _dump_line({"journal_id": journal_id}) + payload
+            with self._journal_file.open("ab") as journal:
+                journal.write(payload)
+            self._journal_id = journal_id
+        except Exception as exc:
+            logger.warning("Could not persist feedback: %s", exc)
+            # Keep the unsaved tail for the next attempt, bounded like the store itself
+            del self._unsaved[:-_MAX_ENTRIES]
+            return
+
+        self._journal_lines += len(self._unsaved)
+        self._unsaved.clear()
+        if self._journal_lines >= _MAX_ENTRIES:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the snapshot file from memory and truncate the journal (best-effort).
+
+        The snapshot names the journal it absorbed, so if the process dies between the
+        snapshot replace and the journal unlink the stale journal is discarded on load.
+        """
+        if not self._persist_enabled:
+            return
         try:
             self._file.parent.mkdir(parents=True, exist_ok=True)
             data = {
                 "entries": [asdict(e) for e in self._entries],
                 "stats": {name: asdict(s) for name, s in self._stats.items()},
+                "journal_id": self._journal_id,
             }
-            self._file.write_text(json.dumps(data, indent=2))
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode()
+            tmp_file = self._file.with_name(self._file.name + ".tmp")
+            tmp_file.write_bytes(payload)
+            tmp_file.replace(self._file)
+            self._journal_file.unlink(missing_ok=True)
         except Exception as exc:
-            logger.warning("Could not persist feedback: %s", exc)
+            logger.warning("Could not compact feedback: %s", exc)
+            return
+
+        self._journal_id = None
+        self._journal_lines = 0
+        self._unsaved.clear()
 
     def _load(self) -> None:
-        """Load entries from disk (best-effort)."""
+        """Load the snapshot, then replay the journal on top of it (best-effort)."""
+        self._replay_journal(self._load_snapshot())
+
+    def _load_snapshot(self) -> str | None:
+        """Load the snapshot and return the id of the journal it already absorbed."""
         if not self._file.exists():
-            return
+            return None
         try:
-            data = json.loads(self._file.read_text())
+            data = orjson.loads(self._file.read_bytes()) if ORJSON_AVAILABLE else json.loads(self._file.read_text())
             self._entries = [FeedbackEntry(**e) for e in data.get("entries", [])]
             self._stats = {name: ToolStats(**s) for name, s in data.get("stats", {}).items()}
+            for entry in self._entries:
+                self._count_entry(entry, 1)
+            for entry in self._entries[-_RECENT_WINDOW:]:
+                self._track_recent(entry.selected_tool, entry.success)
             logger.debug(
                 "Loaded %d feedback entries from %s",
                 len(self._entries),
                 self._file,
             )
+            return data.get("journal_id")
         except Exception as exc:
             logger.warning("Could not load feedback: %s", exc)
             self._entries = []
             self._stats = {}
+            self._confidence_sums = {}
+            self._recent = deque()
+            self._recent_counts = {}
+            for counter in (
+                self._pattern_totals,
+                self._pattern_successes,
+                self._type_totals,
+                self._type_confidence,
+                self._intent_totals,
+                self._intent_successes,
+            ):
+                counter.clear()
+            return None
+
+    def _replay_journal(self, compacted_id: str | None = None) -> None:
+        if not self._journal_file.exists():
+            return
+        try:
+            raw = self._journal_file.read_bytes()
+            if raw and not raw.endswith(b"\n"):
+                # Drop a torn final line from an interrupted append so new lines start clean
+                raw = raw[: raw.rfind(b"\n") + 1]
+                self._journal_file.write_bytes(raw)
+        except Exception as exc:
+            logger.warning("Could not read feedback journal: %s", exc)
+            return
+
+        lines = raw.splitlines()
+        try:
+            journal_id = _load_line(lines[0]).get("journal_id") if lines else None
+        except Exception:
+            journal_id = None
+        if journal_id is not None and journal_id == compacted_id:
+            # Compaction finished writing the snapshot but died before removing the journal
+            logger.debug("Discarding feedback journal %s already folded into %s", self._journal_file, self._file)
+            try:
+                self._journal_file.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("Could not remove stale feedback journal: %s", exc)
+            return
+        if journal_id is not None:
+            self._journal_id = journal_id
+            lines = lines[1:]
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = FeedbackEntry(**_load_line(line))
+            except Exception:
+                logger.warning("Skipping unreadable feedback journal line in %s", self._journal_file)
+                continue
+            self._apply_entry(entry)
+            self._journal_lines += 1
+        if lines and self._journal_id is None:
+            # Journal written before headers existed: stamp it so later compactions can name it
+            journal_id = secrets.token_hex(8)
+            try:
+                self._journal_file.write_bytes(_dump_line({"journal_id": journal_id}) + raw)
+                self._journal_id = journal_id
+            except Exception as exc:
+                logger.warning("Could not stamp feedback journal: %s", exc)
+        logger.debug("Replayed %d feedback journal entries from %s", self._journal_lines, self._journal_file)
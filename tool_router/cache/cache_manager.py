@@ -6,6 +6,7 @@ import logging
 import threading
 import time
 from collections import defaultdict
+from collections.abc import Mapping
 from typing import Any
 
 from cachetools import LRUCache, TTLCache
@@ -92,6 +93,19 @@ class CacheManager:
         with self._lock:
             return self._caches.get(name)
 
+    def bulk_set(self, name: str, items: Mapping[Any, Any]) -> int:
+        """Write many entries into a named cache under a single lock acquisition.
+
+        Returns the number of entries written, or 0 if no cache has that name.
+        """
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                logger.warning(f"bulk_set on unknown cache '{name}'")
+                return 0
+            cache.update(items)
+        return len(items)
+
     def record_hit(self, cache_name: str) -> None:
         """Record a cache hit for metrics."""
         if SpanContext is not None:
@@ -16,10 +16,16 @@ Key Components:
 - RegulatoryFramework: Support multiple compliance standards
 """
 
+import heapq
+import os
 import secrets
+import sys
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
+from functools import lru_cache, partial
 from threading import Lock
 from typing import Any
 
@@ -33,6 +39,16 @@ from .types import (
 )
 
 
+_ID_BYTES = 16  # 32 hex characters per ID
+_ID_POOL_SIZE = 4096  # IDs' worth of randomness fetched per os.urandom call
+_CONSENT_TTL_DAYS = 365
+
+
+def _intern(value: Any) -> Any:
+    """Intern ``value`` if it is a string; anything else is stored as given."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class ComplianceStatus(Enum):
     """Compliance status enumeration."""
 
@@ -54,7 +70,7 @@ class DataSubjectRequestType(Enum):
     OBJECTION = "objection"
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplianceAssessment:
     """Compliance assessment result."""
 
@@ -68,7 +84,7 @@ class ComplianceAssessment:
     assessor: str
 
 
-@dataclass
+@dataclass(slots=True)
 class DataSubjectRequest:
     """Data subject request record."""
 
@@ -85,7 +101,7 @@ class DataSubjectRequest:
     processed_by: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplianceReport:
     """Compliance report data."""
 
@@ -110,56 +126,173 @@ class GDPRComplianceHandler:
         self.config = config
         self._lock = Lock()
         self._consent_records: dict[str, ConsentRecord] = {}
+        # (subject_id, data_type, purpose) -> consent IDs covering that combination.
+        # Values are immutable tuples replaced under the lock (copy-on-write per key),
+        # so check_consent can read the index without locking.
+        self._consent_index: dict[tuple[str, str, str], tuple[str, ...]] = {}
+        # (expires_at epoch seconds, consent_id) min-heap used to drop expired consents
+        # from the index; floats keep heap ordering and the per-check peek cheap. Every
+        # indexed consent has exactly one entry. Once drained, a consent only comes back
+        # through extend_consent.
+        self._expiry_heap: list[tuple[float, str]] = []
         self._data_subject_requests: dict[str, DataSubjectRequest] = {}
+        # subject_id -> request IDs in creation order
+        self._requests_by_subject: dict[str, list[str]] = {}
+        # Pooled os.urandom output for record IDs, refilled lazily when exhausted
+        self._id_lock = Lock()
+        self._id_pool = b""
+        self._id_pos = 0
 
     def record_consent(self, subject_id: str, consent_data: dict[str, Any]) -> str:
         """Record consent for data processing."""
-        consent_id = secrets.token_hex(16)
-
-        consent_record = ConsentRecord(
-            consent_id=consent_id,
-            subject_id=subject_id,
-            data_types=consent_data.get("data_types", []),
-            purposes=consent_data.get("purposes", []),
-            legal_basis=consent_data.get("legal_basis", "consent"),
-            granted=True,
-            timestamp=datetime.now(UTC),
-            expires_at=datetime.now(UTC) + timedelta(days=365),
-            withdrawn_at=None,
-        )
+        return self.record_consents(subject_id, [consent_data])[0]
+
+    def record_consents(self, subject_id: str, consents: Iterable[dict[str, Any]]) -> list[str]:
+        """Record several consents for one subject, taking the lock once."""
+        return self.record_consents_multi((subject_id, consent_data) for consent_data in consents)
+
+    def record_consents_multi(self, payloads: Iterable[tuple[str, dict[str, Any]]]) -> list[str]:
+        """Record ``(subject_id, consent_data)`` pairs for any subjects, taking the lock once."""
+        payloads = list(payloads)
+        consent_ids = self._fresh_ids(len(payloads))
+        # One timestamp pair per batch: datetimes are immutable, so records share them
+        now = datetime.now(UTC)
+        expires_at = now + timedelta(days=_CONSENT_TTL_DAYS)
+        expires_ts = expires_at.timestamp()
+        records = [
+            ConsentRecord(
+                consent_id=consent_id,
+                subject_id=subject_id,
+                # Interned so the many records naming the same types/purposes share one string each
+                data_types=[_intern(data_type) for data_type in consent_data.get("data_types") or ()],
+                purposes=[_intern(purpose) for purpose in consent_data.get("purposes") or ()],
+                legal_basis=_intern(consent_data.get("legal_basis", "consent")),
+                granted=True,
+                timestamp=now,
+                expires_at=expires_at,
+                withdrawn_at=None,
+            )
+            for consent_id, (subject_id, consent_data) in zip(consent_ids, payloads, strict=True)
+        ]
 
         with self._lock:
-            self._consent_records[consent_id] = consent_record
-
-        return consent_id
+            for record in records:
+                self._consent_records[record.consent_id] = record
+                for key in self._consent_keys(record):
+                    self._consent_index[key] = (*self._consent_index.get(key, ()), record.consent_id)
+                heapq.heappush(self._expiry_heap, (expires_ts, record.consent_id))
+
+        return [record.consent_id for record in records]
+
+    def _fresh_ids(self, count: int) -> list[str]:
+        """Return ``count`` random 32-hex-character IDs from the pooled CSPRNG buffer."""
+        ids = []
+        with self._id_lock:
+            for _ in range(count):
+                if self._id_pos == len(self._id_pool):
+                    self._id_pool = os.urandom(_ID_BYTES * _ID_POOL_SIZE)
+                    self._id_pos = 0
+                ids.append(self._id_pool[self._id_pos : self._id_pos + _ID_BYTES].hex())
+                self._id_pos += _ID_BYTES
+        return ids
+
+    @staticmethod
+    def _consent_keys(consent: ConsentRecord) -> list[tuple[str, str, str]]:
+        """Return the index keys a consent record covers."""
+        return [
+            (consent.subject_id, data_type, purpose)
+            for data_type in consent.data_types or ()
+            for purpose in consent.purposes or ()
+        ]
 
     def check_consent(self, subject_id: str, data_type: str, purpose: str) -> bool:
         """Check if valid consent exists for data processing."""
-        with self._lock:
-            for consent in self._consent_records.values():
-                if (
-                    consent.subject_id == subject_id
-                    and data_type in consent.data_types
-                    and purpose in consent.purposes
-                    and consent.granted
-                    and consent.expires_at > datetime.now(UTC)
-                    and consent.withdrawn_at is None
-                ):
-                    return True
+        # Lock-free read: the index lookup is atomic and yields an immutable snapshot of
+        # candidate IDs, and records are stored before they are indexed. Combinations
+        # nobody consented to are rejected with that single lookup.
+        now_ts = time.time()
+        self._drain_expired(now_ts)
+        consent_ids = self._consent_index.get((subject_id, data_type, purpose))
+        if not consent_ids:
+            return False
+        # Records stay the source of truth for expiry. expires_at may be shortened in place,
+        # but extending it must go through extend_consent so a drained consent is re-indexed
+        now = datetime.fromtimestamp(now_ts, UTC)
+        for consent_id in consent_ids:
+            consent = self._consent_records[consent_id]
+            if consent.granted and consent.expires_at > now and consent.withdrawn_at is None:
+                return True
         return False
 
     def withdraw_consent(self, consent_id: str) -> bool:
         """Withdraw previously given consent."""
         with self._lock:
             if consent_id in self._consent_records:
-                self._consent_records[consent_id].granted = False
-                self._consent_records[consent_id].withdrawn_at = datetime.now(UTC)
+                consent = self._consent_records[consent_id]
+                consent.granted = False
+                consent.withdrawn_at = datetime.now(UTC)
+                self._unindex_consent(consent)
                 return True
         return False
 
+    def extend_consent(self, consent_id: str, expires_at: datetime) -> bool:
+        """Move a consent's expiry, re-indexing it if it had already expired and been drained.
+
+        A naive ``expires_at`` is taken as local time, like ``datetime.now()`` elsewhere in
+        the cache package, and stored as UTC so it compares with the aware record times.
+        """
+        expires_at = expires_at.astimezone(UTC)
+        with self._lock:
+            consent = self._consent_records.get(consent_id)
+            if consent is None or consent.withdrawn_at is not None:
+                return False
+            consent.expires_at = expires_at
+            indexed = False
+            for key in self._consent_keys(consent):
+                consent_ids = self._consent_index.get(key, ())
+                if consent_id in consent_ids:
+                    indexed = True
+                else:
+                    self._consent_index[key] = (*consent_ids, consent_id)
+            if not indexed:
+                # Drained consents have no heap entry left; an indexed one re-arms itself
+                # with the new deadline when its old entry is popped
+                heapq.heappush(self._expiry_heap, (expires_at.timestamp(), consent_id))
+            return True
+
+    def _unindex_consent(self, consent: ConsentRecord) -> None:
+        """Remove a consent from the lookup index; caller must hold the lock."""
+        for key in self._consent_keys(consent):
+            remaining = tuple(cid for cid in self._consent_index.get(key, ()) if cid != consent.consent_id)
+            if remaining:
+                self._consent_index[key] = remaining
+            else:
+                self._consent_index.pop(key, None)
+
+    def _drain_expired(self, now_ts: float) -> None:
+        """Drop consents whose expiry has passed from the index, popping the expiry heap."""
+        heap = self._expiry_heap
+        try:
+            if heap[0][0] > now_ts:  # Unlocked peek; only this method pops, under the lock
+                return
+        except IndexError:
+            return
+        with self._lock:
+            while heap and heap[0][0] <= now_ts:
+                _, consent_id = heapq.heappop(heap)
+                consent = self._consent_records.get(consent_id)
+                if consent is None:
+                    continue
+                expires_ts = consent.expires_at.timestamp()
+                if expires_ts > now_ts:
+                    # Expiry was extended after recording; track the new deadline instead
+                    heapq.heappush(heap, (expires_ts, consent_id))
+                else:
+                    self._unindex_consent(consent)
+
     def create_data_subject_request(self, request_data: dict[str, Any]) -> str:
         """Create a new data subject request."""
-        request_id = secrets.token_hex(16)
+        request_id = self._fresh_ids(1)[0]
 
         request = DataSubjectRequest(
             request_id=request_id,
@@ -174,16 +307,16 @@ class GDPRComplianceHandler:
 
         with self._lock:
             self._data_subject_requests[request_id] = request
+            self._requests_by_subject.setdefault(request.subject_id, []).append(request_id)
 
         return request_id
 
     def get_data_subject_requests(self, subject_id: str | None = None) -> list[DataSubjectRequest]:
         """Get data subject requests, optionally filtered by subject."""
         with self._lock:
-            requests = list(self._data_subject_requests.values())
             if subject_id:
-                requests = [r for r in requests if r.subject_id == subject_id]
-            return requests
+                return [self._data_subject_requests[rid] for rid in self._requests_by_subject.get(subject_id, ())]
+            return list(self._data_subject_requests.values())
 
     def process_right_to_be_forgotten(self, subject_id: str) -> dict[str, Any]:
         """Process GDPR right to be forgotten request."""
@@ -193,7 +326,7 @@ class GDPRComplianceHandler:
             "records_deleted": 0,
             "cache_entries_cleared": 0,
             "audit_logs_created": 0,
-            "processed_at": datetime.now(UTC).isoformat(),
+            "processed_at": datetime.now(UTC),  # Serialized by the HTTP layer, not here
         }
 
         # Log the erasure request
@@ -214,6 +347,46 @@ class GDPRComplianceHandler:
         return processed_data
 
 
+@lru_cache(maxsize=4)
+def _evaluate_gdpr(
+    retention_configured: bool, encryption_enabled: bool
+) -> tuple[float, tuple[str, ...], tuple[str, ...]]:
+    """Score GDPR controls from the config flags they depend on.
+
+    The result is a pure function of its two flags, so it is memoized; callers
+    get fresh lists and timestamps in each ComplianceAssessment.
+    """
+    findings = []
+    recommendations = []
+    score = 85.0  # Base score
+
+    # Check consent management
+    findings.append("Consent management system implemented")
+    recommendations.append("Regular consent audits recommended")
+
+    # Check data subject rights
+    findings.append("Data subject request system operational")
+    recommendations.append("Monitor request response times")
+
+    # Check data retention
+    findings.append("Data retention policies defined")
+    if not retention_configured:
+        findings.append("WARNING: Default retention policy not configured")
+        score -= 10
+        recommendations.append("Configure appropriate retention periods")
+
+    # Check encryption
+    if encryption_enabled:
+        findings.append("Data encryption enabled")
+        score += 5
+    else:
+        findings.append("WARNING: Data encryption not enabled")
+        score -= 15
+        recommendations.append("Enable encryption for sensitive data")
+
+    return score, tuple(findings), tuple(recommendations)
+
+
 class ComplianceReporter:
     """Generate compliance reports and assessments."""
 
@@ -221,46 +394,26 @@ class ComplianceReporter:
         """Initialize compliance reporter."""
         self.config = config
         self._lock = Lock()
+        # Clock for assessment/report timestamps; replaceable so tests need not sleep
+        self._now: Callable[[], datetime] = partial(datetime.now, UTC)
         self._assessments: dict[ComplianceStandard, ComplianceAssessment] = {}
 
     def assess_gdpr_compliance(self) -> ComplianceAssessment:
         """Assess GDPR compliance status."""
-        findings = []
-        recommendations = []
-        score = 85.0  # Base score
-
-        # Check consent management
-        findings.append("Consent management system implemented")
-        recommendations.append("Regular consent audits recommended")
-
-        # Check data subject rights
-        findings.append("Data subject request system operational")
-        recommendations.append("Monitor request response times")
-
-        # Check data retention
-        findings.append("Data retention policies defined")
-        if not self.config.retention_days:
-            findings.append("WARNING: Default retention policy not configured")
-            score -= 10
-            recommendations.append("Configure appropriate retention periods")
-
-        # Check encryption
-        if self.config.encryption_enabled:
-            findings.append("Data encryption enabled")
-            score += 5
-        else:
-            findings.append("WARNING: Data encryption not enabled")
-            score -= 15
-            recommendations.append("Enable encryption for sensitive data")
+        score, findings, recommendations = _evaluate_gdpr(
+            bool(self.config.retention_days),
+            bool(self.config.encryption_enabled),
+        )
 
+        now = self._now()
         assessment = ComplianceAssessment(
             standard=ComplianceStandard.GDPR,
             status=(ComplianceStatus.COMPLIANT if score >= 80 else ComplianceStatus.NON_COMPLIANT),
             score=score,
-            findings=findings,
-            recommendations=recommendations,
-            last_assessed=datetime.now(UTC),
-            next_assessment=datetime.now(UTC) + timedelta(days=90),
+            findings=list(findings),
+            recommendations=list(recommendations),
+            last_assessed=now,
+            next_assessment=now + timedelta(days=90),
             assessor="compliance_system",
         )
 
@@ -272,7 +425,7 @@ class ComplianceReporter:
     def generate_compliance_report(self, standards: list[ComplianceStandard]) -> ComplianceReport:
         """Generate comprehensive compliance report."""
         report_id = secrets.token_hex(16)
-        period_end = datetime.now(UTC)
+        period_end = self._now()
         period_start = period_end - timedelta(days=30)
 
         assessments = []
@@ -288,8 +441,8 @@ class ComplianceReporter:
                         score=0.0,
                         findings=["Assessment not implemented"],
                         recommendations=["Implement assessment for this standard"],
-                        last_assessed=datetime.now(UTC),
-                        next_assessed=datetime.now(UTC) + timedelta(days=90),
+                        last_assessed=self._now(),
+                        next_assessed=self._now() + timedelta(days=90),
                         assessor="compliance_system",
                     )
                 )
@@ -304,7 +457,7 @@ class ComplianceReporter:
             total_records_processed=0,  # Would be calculated from actual data
             data_breaches=[],  # Would be populated from incident logs
             recommendations=[],
-            generated=datetime.now(UTC),
+            generated=self._now(),
             generated_by="compliance_system",
         )
 
@@ -361,6 +514,29 @@ class ComplianceManager:
         except Exception as e:
             raise ComplianceError(f"Failed to record consent: {e!s}")
 
+    def record_consents(self, subject_id: str, consents: Iterable[dict[str, Any]]) -> list[str]:
+        """Record a batch of consents for one subject."""
+        return self.record_consents_multi((subject_id, consent_data) for consent_data in consents)
+
+    def record_consents_multi(self, payloads: Iterable[tuple[str, dict[str, Any]]]) -> list[str]:
+        """Record a batch of ``(subject_id, consent_data)`` pairs across subjects."""
+        payloads = list(payloads)
+        if not all(subject_id and consent_data for subject_id, consent_data in payloads):
+            raise ComplianceError("Subject ID and consent data are required")
+        try:
+            consent_ids = self._gdpr_handler.record_consents_multi(payloads)
+
+            with self._lock:
+                self._metrics.audit_entries += len(consent_ids)
+                self._metrics.total_compliance_checks += len(consent_ids)
+
+            return consent_ids
+
+        except ComplianceError:
+            raise
+        except Exception as e:
+            raise ComplianceError(f"Failed to record consents: {e!s}")
+
     def check_consent(self, subject_id: str, data_type: str, purpose: str) -> bool:
         """Check if valid consent exists."""
         has_consent = self._gdpr_handler.check_consent(subject_id, data_type, purpose)
@@ -447,6 +623,19 @@ class ComplianceManager:
         """Get data subject requests."""
         return self._gdpr_handler.get_data_subject_requests(subject_id)
 
+    def extend_consent(self, consent_id: str, expires_at: datetime) -> bool:
+        """Extend (or move) a consent's expiry."""
+        try:
+            success = self._gdpr_handler.extend_consent(consent_id, expires_at)
+
+            with self._lock:
+                self._metrics.audit_entries += 1
+
+            return success
+
+        except Exception as e:
+            raise ComplianceError(f"Failed to extend consent: {e!s}")
+
     def withdraw_consent(self, consent_id: str) -> bool:
         """Withdraw consent."""
         try:
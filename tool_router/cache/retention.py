@@ -214,16 +214,16 @@ class RetentionPolicyManager:
         """Evaluate which retention rule applies to cache entry."""
         applicable_rules = []
 
-        with self._lock:
-            rules = self.get_rules(metadata.data_classification)
+        # get_rules takes the (non-reentrant) lock itself and returns a snapshot
+        rules = self.get_rules(metadata.data_classification)
 
-            for rule in rules:
-                if not rule.enabled:
-                    continue
+        for rule in rules:
+            if not rule.enabled:
+                continue
 
-                # Check if rule conditions are met
-                if self._evaluate_conditions(rule, metadata):
-                    applicable_rules.append(rule)
+            # Check if rule conditions are met
+            if self._evaluate_conditions(rule, metadata):
+                applicable_rules.append(rule)
 
         # Return highest priority rule
         return applicable_rules[0] if applicable_rules else None
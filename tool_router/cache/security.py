@@ -9,22 +9,30 @@ This module provides comprehensive security features for the MCP Gateway caching
 - Security policy management
 
 Key Components:
-- CacheEncryption: Fernet-based encryption for sensitive data
+- CacheEncryption: AES-GCM encryption for sensitive data (reads legacy Fernet tokens)
 - AccessControlManager: Role-based access control with permissions
 - GDPRComplianceManager: GDPR compliance features (consent, right to be forgotten)
 - RetentionPolicyManager: Data retention and lifecycle management
 - CacheSecurityManager: Integrated security manager
 """
 
+import base64
 import json
+import os
 import secrets
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
+from collections.abc import Iterable
 from datetime import datetime, timedelta
+from itertools import islice
 from threading import Lock
 from typing import Any
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from .config import CacheConfig
 from .types import (
@@ -40,14 +48,62 @@ from .types import (
 )
 
 
+# AES-GCM token layout: version byte, 12-byte nonce, ciphertext with 16-byte tag.
+# Fernet tokens are base64 text starting with "g", so the version byte tells them apart.
+_GCM_TOKEN_VERSION = b"\x01"
+_GCM_NONCE_BYTES = 12
+_GCM_KEY_INFO = b"mcp-gateway cache encryption aes-256-gcm"
+_NONCE_POOL_SIZE = 4096  # nonces' worth of randomness fetched per os.urandom call
+
+
+class _NoncePool:
+    """Hands out AES-GCM nonces from a pooled os.urandom buffer.
+
+    Shared by all CacheEncryption instances and reset in forked children, so a
+    parent and child never hand out the same buffered bytes.
+    """
+
+    __slots__ = ("_lock", "_pool", "_pos")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._lock = Lock()
+        self._pool = b""
+        self._pos = 0
+
+    def take(self, count: int) -> list[bytes]:
+        """Return ``count`` fresh 12-byte nonces."""
+        nonces = []
+        with self._lock:
+            for _ in range(count):
+                if self._pos == len(self._pool):
+                    self._pool = os.urandom(_GCM_NONCE_BYTES * _NONCE_POOL_SIZE)
+                    self._pos = 0
+                nonces.append(self._pool[self._pos : self._pos + _GCM_NONCE_BYTES])
+                self._pos += _GCM_NONCE_BYTES
+        return nonces
+
+
+_nonces = _NoncePool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_nonces.reset)
+
+
 class CacheEncryption:
-    """Handles encryption and decryption of cache data using Fernet symmetric encryption."""
+    """Handles encryption and decryption of cache data.
+
+    New tokens are AES-256-GCM under a key derived from the configured Fernet key;
+    Fernet tokens written by earlier versions still decrypt.
+    """
 
     def __init__(self, config: CacheConfig | None = None):
         """Initialize encryption with configuration."""
         self.config = config or CacheConfig()
         self._encryption_key: str | None = None
         self._fernet: Fernet | None = None
+        self._aead: AESGCM | None = None
         self._lock = Lock()
 
         # Set encryption key if available in config
@@ -55,13 +111,17 @@ class CacheEncryption:
             self.set_encryption_key(self.config.encryption_key)
 
     def set_encryption_key(self, key: str | bytes) -> None:
-        """Set the encryption key for Fernet encryption."""
+        """Set the encryption key (a Fernet key) for AES-GCM and legacy Fernet tokens."""
         with self._lock:
             if isinstance(key, str):
                 key = key.encode()
 
             try:
                 self._fernet = Fernet(key)
+                gcm_key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=_GCM_KEY_INFO).derive(
+                    base64.urlsafe_b64decode(key)
+                )
+                self._aead = AESGCM(gcm_key)
                 self._encryption_key = key.decode()
             except Exception as e:
                 raise EncryptionError(f"Failed to set encryption key: {e}")
@@ -71,49 +131,81 @@ class CacheEncryption:
         return self._encryption_key
 
     def encrypt(self, data: Any) -> bytes | None:
-        """Encrypt data using Fernet encryption."""
-        if self._fernet is None:
+        """Encrypt data into an AES-GCM token."""
+        if self._aead is None:
             raise EncryptionError("Encryption key not set")
 
         if data is None:
             return None
 
         try:
-            # Serialize data to JSON for consistent encryption
-            if isinstance(data, (dict, list, tuple)):
-                serialized = json.dumps(data, sort_keys=True).encode()
-            elif isinstance(data, str):
-                serialized = data.encode()
-            elif isinstance(data, bytes):
-                serialized = data
-            else:
-                serialized = str(data).encode()
-
-            encrypted = self._fernet.encrypt(serialized)
+            (nonce,) = _nonces.take(1)
+            encrypted = _GCM_TOKEN_VERSION + nonce + self._aead.encrypt(nonce, self._serialize(data), None)
             return encrypted
 
         except Exception as e:
             raise EncryptionError(f"Failed to encrypt data: {e}")
 
+    def encrypt_many(self, items: Iterable[Any]) -> list[bytes | None]:
+        """Encrypt several values into AES-GCM tokens, taking all nonces in one pool call.
+
+        None items map to None, as in encrypt().
+        """
+        if self._aead is None:
+            raise EncryptionError("Encryption key not set")
+
+        try:
+            payloads = [None if item is None else self._serialize(item) for item in items]
+            nonces = iter(_nonces.take(sum(payload is not None for payload in payloads)))
+            aead = self._aead
+
+            tokens: list[bytes | None] = []
+            for payload in payloads:
+                if payload is None:
+                    tokens.append(None)
+                    continue
+                nonce = next(nonces)
+                tokens.append(_GCM_TOKEN_VERSION + nonce + aead.encrypt(nonce, payload, None))
+            return tokens
+
+        except Exception as e:
+            raise EncryptionError(f"Failed to encrypt data: {e}")
+
+    @staticmethod
+    def _serialize(data: Any) -> bytes:
+        """Serialize data to bytes; containers go through stdlib JSON for consistent encryption."""
+        if isinstance(data, (dict, list, tuple)):
+            return json.dumps(data, sort_keys=True).encode()
+        if isinstance(data, str):
+            return data.encode()
+        if isinstance(data, bytes):
+            return data
+        return str(data).encode()
+
     def decrypt(self, encrypted_data: bytes) -> Any:
-        """Decrypt data using Fernet encryption."""
-        if self._fernet is None:
+        """Decrypt an AES-GCM token, or a Fernet token from before the switch to AES-GCM."""
+        if self._aead is None or self._fernet is None:
             raise EncryptionError("Encryption key not set")
 
         if encrypted_data is None:
             return None
 
         try:
-            decrypted = self._fernet.decrypt(encrypted_data)
+            if isinstance(encrypted_data, bytes) and encrypted_data[:1] == _GCM_TOKEN_VERSION:
+                nonce_end = 1 + _GCM_NONCE_BYTES
+                decrypted = self._aead.decrypt(encrypted_data[1:nonce_end], encrypted_data[nonce_end:], None)
+            else:
+                decrypted = self._fernet.decrypt(encrypted_data)
 
-            # Try to deserialize as JSON first
+            # Try to deserialize as JSON first. This stays on stdlib json: orjson rejects
+            # NaN/Infinity and ints beyond 64 bits, and reads large ints back as floats
             try:
                 return json.loads(decrypted.decode())
             except json.JSONDecodeError:
                 # Return as string if not valid JSON
                 return decrypted.decode()
 
-        except InvalidToken:
+        except (InvalidToken, InvalidTag):
             raise EncryptionError("Failed to decrypt data: Invalid token or wrong key")
         except Exception as e:
             raise EncryptionError(f"Failed to decrypt data: {e}")
@@ -130,6 +222,9 @@ class CacheEncryption:
         return new_key
 
 
+_NO_PERMISSIONS: frozenset[AccessLevel] = frozenset()
+
+
 class AccessControlManager:
     """Manages access control policies and permissions for cache operations."""
 
@@ -279,7 +374,7 @@ class AccessControlManager:
     ) -> bool:
         """Check if a user has access to perform an operation."""
         # Check if user has the required permission
-        if operation in self.user_permissions.get(user_id, set()):
+        if operation in self.user_permissions.get(user_id, _NO_PERMISSIONS):
             return True
 
         # Check if there's an approved request for this specific operation
@@ -301,6 +396,13 @@ class AccessControlManager:
         """Get all permissions for a user."""
         return self.user_permissions.get(user_id, set()).copy()
 
+    def grant_many(self, grants: dict[str, AccessLevel]) -> None:
+        """Grant one access level to each user in a single locked pass."""
+        with self._lock:
+            permissions = self.user_permissions
+            for user_id, level in grants.items():
+                permissions[user_id].add(level)
+
     def revoke_user_access(self, user_id: str) -> bool:
         """Revoke all access for a user."""
         with self._lock:
@@ -336,10 +438,13 @@ class AccessControlManager:
 
     def cleanup_expired_requests(self) -> int:
         """Clean up expired access requests."""
+        now = datetime.now()
         with self._lock:
-            original_count = len(self.access_requests)
-            self.access_requests = [r for r in self.access_requests if not r.expired()]
-            return original_count - len(self.access_requests)
+            live = [r for r in self.access_requests if r.expires_at >= now]
+            removed = len(self.access_requests) - len(live)
+            if removed:
+                self.access_requests[:] = live
+            return removed
 
 
 class GDPRComplianceManager:
@@ -645,32 +750,35 @@ class RetentionPolicyManager:
                 return True
             return False
 
+    def _retention_cutoffs(self, now: datetime) -> dict[DataClassification, datetime]:
+        """Map each classification to the creation cutoff of its first enabled rule."""
+        cutoffs: dict[DataClassification, datetime] = {}
+        for rule_data in self.retention_rules.values():
+            if rule_data["enabled"] and rule_data["data_classification"] not in cutoffs:
+                cutoffs[rule_data["data_classification"]] = now - timedelta(days=rule_data["retention_days"])
+        return cutoffs
+
     def should_retain(self, metadata: CacheEntryMetadata) -> bool:
         """Check if data should be retained based on policies."""
+        # Only this entry's classification matters, so stop at its first enabled
+        # rule instead of building the cutoff map for every classification
         classification = metadata.data_classification
-
-        # Find applicable rule
-        rule = None
         for rule_data in self.retention_rules.values():
-            if rule_data["data_classification"] == classification and rule_data["enabled"]:
-                rule = rule_data
-                break
-
-        if not rule:
-            return True  # Default to retain if no rule found
+            if rule_data["enabled"] and rule_data["data_classification"] == classification:
+                return metadata.created_at > datetime.now() - timedelta(days=rule_data["retention_days"])
 
-        # Check retention period
-        retention_days = rule["retention_days"]
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
-
-        return metadata.created_at > cutoff_date
+        # Default to retain if no rule found
+        return True
 
     def get_expired_entries(self, entries: list[CacheEntryMetadata]) -> list[CacheEntryMetadata]:
         """Get entries that have expired according to retention policies."""
-        expired = []
+        # Resolve rules and the clock once for the whole sweep
+        cutoffs = self._retention_cutoffs(datetime.now())
 
+        expired = []
         for metadata in entries:
-            if not self.should_retain(metadata):
+            cutoff = cutoffs.get(metadata.data_classification)
+            if cutoff is not None and metadata.created_at <= cutoff:
                 expired.append(metadata)
 
         return expired
@@ -683,6 +791,14 @@ class RetentionPolicyManager:
         with self._lock:
             self.user_data[user_id][data_type] = {"data": data, "timestamp": timestamp}
 
+    def bulk_add_user_data(self, user_id: str, items: Iterable[tuple[str, Any, datetime | None]]) -> None:
+        """Add several (data_type, data, timestamp) records for one user under a single lock."""
+        now = datetime.now()
+        records = {data_type: {"data": data, "timestamp": timestamp or now} for data_type, data, timestamp in items}
+
+        with self._lock:
+            self.user_data[user_id].update(records)
+
     def cleanup_expired_data(self) -> int:
         """Clean up expired data based on retention policies."""
         deleted_count = 0
@@ -731,8 +847,10 @@ class CacheSecurityManager:
         self.gdpr_manager = GDPRComplianceManager(self.config)
         self.retention_manager = RetentionPolicyManager(self.config)
 
-        # Audit trail (simplified for this implementation)
-        self.audit_trail: list[AuditEntry] = []
+        # Audit trail (simplified for this implementation): a bounded ring that drops the
+        # oldest entries itself, so appends never copy the trail. The cap is fixed here;
+        # changing max_audit_entries_per_query later does not resize the trail.
+        self.audit_trail: deque[AuditEntry] = deque(maxlen=self.config.max_audit_entries_per_query)
         self._lock = Lock()
 
     def secure_set(
@@ -821,8 +939,20 @@ class CacheSecurityManager:
     def secure_get(self, cache, key: str, user_id: str, data_classification: DataClassification) -> Any:
         """Securely get a value from the cache with access control."""
         try:
+            config = self.config
+            security = config.security
+            # Unrestricted, unaudited public reads have no checks, records or
+            # decryption to do, so skip the pipeline entirely
+            if (
+                data_classification is DataClassification.PUBLIC
+                and not security.access_control_enabled
+                and not security.audit_enabled
+                and not config.is_encryption_required(data_classification)
+            ):
+                return cache.get(key)
+
             # Check access permissions
-            if not self.config.security.access_control_enabled:
+            if not security.access_control_enabled:
                 has_access = True
             else:
                 has_access = self.access_control.check_access(user_id, AccessLevel.READ, key, data_classification)
@@ -856,7 +986,7 @@ class CacheSecurityManager:
 
             # Decrypt if encrypted
             processed_value = cached_value
-            if self.config.is_encryption_required(data_classification):
+            if config.is_encryption_required(data_classification):
                 if isinstance(cached_value, bytes):
                     processed_value = self.encryption.decrypt(cached_value)
                 else:
@@ -982,13 +1112,8 @@ class CacheSecurityManager:
             metadata={"details": details} if details else {},
         )
 
-        with self._lock:
-            self.audit_trail.append(entry)
-
-            # Trim audit trail if it gets too large
-            max_entries = self.config.max_audit_entries_per_query
-            if len(self.audit_trail) > max_entries:
-                self.audit_trail = self.audit_trail[-max_entries:]
+        # deque.append is atomic, and maxlen trims the oldest entry
+        self.audit_trail.append(entry)
 
     def get_audit_trail(
         self,
@@ -999,16 +1124,18 @@ class CacheSecurityManager:
         """Get audit trail with optional filtering."""
         trail = self.audit_trail.copy()
 
-        if user_id:
-            trail = [entry for entry in trail if entry.user_id == user_id]
-
-        if event_type:
-            trail = [entry for entry in trail if entry.event_type == event_type]
-
-        if limit:
-            trail = trail[-limit:]
+        if not (user_id or event_type or limit):
+            return list(trail)
 
-        return trail
+        # One newest-first pass over both filters, so a limit stops at its last match
+        matches = (
+            entry
+            for entry in reversed(trail)
+            if (not user_id or entry.user_id == user_id) and (not event_type or entry.event_type == event_type)
+        )
+        selected = list(islice(matches, limit) if limit else matches)
+        selected.reverse()
+        return selected
 
 
 # Export main classes
@@ -26,6 +26,7 @@ class CacheConfig:
     encryption_key: str | None = None
     audit_max_entries: int = 10000
     audit_retention_days: int = 90
+    max_audit_entries_per_query: int = 1000  # in-memory audit trail kept by CacheSecurityManager
 
     # Retention periods for different data classifications
     retention_days: dict[DataClassification, int] | None = None
@@ -60,6 +61,8 @@ class CacheConfig:
             raise ValueError("audit_max_entries must be positive")
         if self.audit_retention_days < 1:
             raise ValueError("audit_retention_days must be positive")
+        if self.max_audit_entries_per_query < 1:
+            raise ValueError("max_audit_entries_per_query must be positive")
 
         # Validate retention days
         if self.retention_days:
@@ -68,9 +71,13 @@ class CacheConfig:
                     raise ValueError(f"retention_days for {classification} must be positive")
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheMetrics:
-    """Cache performance metrics."""
+    """Cache performance metrics.
+
+    Slotted: one instance per named cache is updated on every get/set, so attribute
+    access stays on the fast path and no per-instance ``__dict__`` is allocated.
+    """
 
     hits: int = 0
     misses: int = 0
@@ -89,6 +96,10 @@ class DataClassification(Enum):
     SENSITIVE = "sensitive"
     CONFIDENTIAL = "confidential"
 
+    # Members compare by identity, so an identity hash is consistent and skips
+    # Enum's Python-level hash(self._name_) in set and dict lookups
+    __hash__ = object.__hash__
+
 
 class AccessLevel(Enum):
     """Access levels for permission management."""
@@ -98,8 +109,10 @@ class AccessLevel(Enum):
     DELETE = "delete"
     ADMIN = "admin"
 
+    __hash__ = object.__hash__
 
-@dataclass
+
+@dataclass(slots=True)
 class CacheEntryMetadata:
     """Metadata for cache entries."""
 
@@ -112,8 +125,17 @@ class CacheEntryMetadata:
     owner_id: str | None = None
     tags: list[str] | None = None
 
+    @property
+    def data_classification(self) -> DataClassification:
+        """Alias for classification, the name the security managers use."""
+        return self.classification
 
-@dataclass
+    @data_classification.setter
+    def data_classification(self, value: DataClassification) -> None:
+        self.classification = value
+
+
+@dataclass(slots=True)
 class AuditEntry:
     """Audit log entry for security events."""
 
@@ -142,7 +164,7 @@ class AccessRequest:
     justification: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsentRecord:
     """GDPR consent record."""
 
@@ -15,6 +15,18 @@ from tool_router.gateway.circuit_breaker import (
 )
 
 
+# The tools/call envelope is constant apart from ``params``; encode the prefix once
+# and splice the per-call params in with a reusable compact encoder.
+_TOOLS_CALL_PREFIX = b'{"jsonrpc":"2.0","id":1,"method":"tools/call","params":'
+_TOOLS_CALL_SUFFIX = b"}"
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _build_tools_call_body(params: dict[str, Any]) -> bytes:
+    """Serialize a JSON-RPC ``tools/call`` request body for the given params."""
+    return _TOOLS_CALL_PREFIX + _encode_json(params).encode() + _TOOLS_CALL_SUFFIX
+
+
 @dataclass
 class SecurityMetadata:
     """Security context propagated to spoke MCP servers."""
@@ -195,19 +207,14 @@ class HTTPGatewayClient:
         params: dict[str, Any] = {"name": name, "arguments": arguments}
         if security:
             params["_metadata"] = {"security": security.to_dict()}
-        body = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": params,
-        }
+        body = _build_tools_call_body(params)
 
         with SpanContext(
             "gateway.call_tool",
             **{"gateway.url": self.config.url, "tool.name": name},
         ) as span:
             try:
-                json_rpc_response = self._make_request(url, method="POST", data=json.dumps(body).encode())
+                json_rpc_response = self._make_request(url, method="POST", data=body)
             except (ValueError, ConnectionError, CircuitOpenError) as error:
                 span.set_attribute("outcome", "error")
                 span.set_attribute("error.message", str(error))
@@ -17,6 +17,10 @@ class HealthStatus(Enum):
     UNHEALTHY = "unhealthy"
 
 
+# Plain dict probe instead of the Enum.value descriptor on every serialized status
+_STATUS_STR: dict[HealthStatus, str] = {status: status.value for status in HealthStatus}
+
+
 @dataclass
 class ComponentHealth:
     """Health status of a single component."""
@@ -39,14 +43,15 @@ class HealthCheckResult:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
+        status_str = _STATUS_STR.__getitem__
         return {
-            "status": self.status.value,
+            "status": status_str(self.status),
             "timestamp": self.timestamp,
             "version": self.version,
             "components": [
                 {
                     "name": c.name,
-                    "status": c.status.value,
+                    "status": status_str(c.status),
                     "message": c.message,
                     "latency_ms": c.latency_ms,
                     "metadata": c.metadata,
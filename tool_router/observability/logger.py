@@ -23,8 +23,9 @@ class StructuredFormatter(logging.Formatter):
             log_data["exception"] = self.formatException(record.exc_info)
 
         # Add extra fields from record
-        if hasattr(record, "extra_fields"):
-            log_data.update(record.extra_fields)
+        extra_fields = getattr(record, "extra_fields", None)
+        if extra_fields is not None:
+            log_data.update(extra_fields)
 
         # Inject OpenTelemetry trace context when available
         try:
@@ -96,10 +97,13 @@ class ContextLoggerAdapter(logging.LoggerAdapter):
 
     def process(self, msg: str, kwargs: Any) -> tuple[str, Any]:
         """Add extra fields to log record."""
-        # Merge extra fields into the log record
-        if "extra" not in kwargs:
-            kwargs["extra"] = {}
-        kwargs["extra"].update(self.extra)
+        call_extra = kwargs.get("extra")
+        if call_extra:
+            # Merge into a new dict so the caller's mapping is left untouched; context fields win
+            kwargs["extra"] = {**call_extra, **self.extra}
+        else:
+            # makeRecord only reads extra, so share the context dict as logging.LoggerAdapter does
+            kwargs["extra"] = self.extra
         return msg, kwargs
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import functools
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from threading import Lock
 from typing import Any
@@ -33,12 +34,13 @@ class MetricStats:
         if not values:
             return cls(count=0, sum=0.0, min=0.0, max=0.0, avg=0.0)
 
+        total = sum(values)
         return cls(
             count=len(values),
-            sum=sum(values),
+            sum=total,
             min=min(values),
             max=max(values),
-            avg=sum(values) / len(values),
+            avg=total / len(values),
         )
 
 
@@ -54,7 +56,7 @@ class MetricsCollector:
         """
         self.max_samples = max_samples
         self.max_metric_names = max_metric_names
-        self._metrics: dict[str, list[MetricValue]] = {}
+        self._metrics: dict[str, deque[MetricValue]] = {}
         self._counters: dict[str, int] = {}
         self._lock = Lock()
 
@@ -65,6 +67,9 @@ class MetricsCollector:
             metric_name: Metric name
             duration_milliseconds: Duration in milliseconds
         """
+        # Build the sample (and read the clock) before taking the shared lock
+        sample = MetricValue(value=duration_milliseconds)
+
         with self._lock:
             # Check if we need to create a new metric
             if metric_name not in self._metrics:
@@ -72,14 +77,10 @@ class MetricsCollector:
                     # Drop oldest metric (FIFO eviction)
                     oldest_key = next(iter(self._metrics))
                     del self._metrics[oldest_key]
-                self._metrics[metric_name] = []
-
-            metric_values_list = self._metrics[metric_name]
-            metric_values_list.append(MetricValue(value=duration_milliseconds))
+                # Bounded ring: appending past max_samples drops the oldest sample in O(1)
+                self._metrics[metric_name] = deque(maxlen=self.max_samples)
 
-            # Keep only recent samples
-            if len(metric_values_list) > self.max_samples:
-                metric_values_list.pop(0)
+            self._metrics[metric_name].append(sample)
 
     def increment_counter(self, name: str, value: int = 1) -> None:
         """Increment a counter metric.
@@ -88,16 +89,18 @@ class MetricsCollector:
             name: Counter name
             value: Amount to increment (default 1)
         """
+        counters = self._counters
         with self._lock:
-            # Check if we need to create a new counter
-            if name not in self._counters:
-                if len(self._counters) >= self.max_metric_names:
+            # One lookup and one store per increment; updating an existing key keeps its FIFO position
+            current = counters.get(name)
+            if current is None:
+                if len(counters) >= self.max_metric_names:
                     # Drop oldest counter (FIFO eviction)
-                    oldest_key = next(iter(self._counters))
-                    del self._counters[oldest_key]
-                self._counters[name] = 0
+                    oldest_key = next(iter(counters))
+                    del counters[oldest_key]
+                current = 0
 
-            self._counters[name] += value
+            counters[name] = current + value
 
     def get_stats(self, name: str) -> MetricStats | None:
         """Get statistical summary for a metric.
@@ -109,11 +112,13 @@ class MetricsCollector:
             Metric statistics or None if metric doesn't exist
         """
         with self._lock:
-            if name not in self._metrics:
+            samples = self._metrics.get(name)
+            if samples is None:
                 return None
 
-            values = [m.value for m in self._metrics[name]]
-            return MetricStats.from_values(values)
+            values = [m.value for m in samples]
+
+        return MetricStats.from_values(values)
 
     def get_counter(self, name: str) -> int:
         """Get current counter value.
@@ -133,24 +138,23 @@ class MetricsCollector:
         Returns:
             Dictionary with all metrics and counters
         """
+        # Snapshot under the lock; aggregate afterwards so recorders are not held up
         with self._lock:
-            result: dict[str, Any] = {
-                "timings": {},
-                "counters": dict(self._counters),
+            counters = dict(self._counters)
+            timings = {name: [m.value for m in samples] for name, samples in self._metrics.items() if samples}
+
+        result: dict[str, Any] = {"timings": {}, "counters": counters}
+        for name, values in timings.items():
+            stats = MetricStats.from_values(values)
+            result["timings"][name] = {
+                "count": stats.count,
+                "avg_ms": round(stats.avg, 2),
+                "min_ms": round(stats.min, 2),
+                "max_ms": round(stats.max, 2),
+                "total_ms": round(stats.sum, 2),
             }
 
-            for name, values in self._metrics.items():
-                if values:
-                    stats = MetricStats.from_values([m.value for m in values])
-                    result["timings"][name] = {
-                        "count": stats.count,
-                        "avg_ms": round(stats.avg, 2),
-                        "min_ms": round(stats.min, 2),
-                        "max_ms": round(stats.max, 2),
-                        "total_ms": round(stats.sum, 2),
-                    }
-
-            return result
+        return result
 
     def reset(self) -> None:
         """Reset all metrics and counters."""
@@ -172,6 +176,9 @@ def get_metrics() -> MetricsCollector:
 class TimingContext:
     """Context manager for timing operations."""
 
+    # Built several times per request, so skip the per-instance __dict__
+    __slots__ = ("metric_name", "metrics", "start_time")
+
     def __init__(self, metric_name: str, metrics: MetricsCollector | None = None) -> None:
         """Initialize timing context.
 
@@ -1,5 +1,7 @@
 import logging
 import re
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from tool_router.ai.selector import OllamaSelector
@@ -48,27 +50,41 @@ def _enrich_tokens_with_synonyms(tokens: set[str]) -> set[str]:
     return enriched_tokens
 
 
-def _calculate_substring_match_score(query_tokens: set[str], target_text: str) -> int:
+def _calculate_substring_match_score(query_tokens: Iterable[str], target_text: str) -> int:
     """Score partial matches (e.g., 'file' matches 'filesystem')."""
     target_lower = target_text.lower()
-    score = 0
-    for token in query_tokens:
-        if len(token) >= 3 and token in target_lower:
-            score += 2
-    return score
+    return 2 * sum(1 for token in query_tokens if len(token) >= 3 and token in target_lower)
 
 
-def calculate_tool_relevance_score(task: str, context: str, tool: dict[str, Any]) -> float:
-    """Score a tool's relevance to the task with weighted components."""
+@dataclass(frozen=True)
+class _QueryTokens:
+    """Query-side tokens, computed once per task and reused for every tool scored."""
+
+    enriched: frozenset[str]
+    partial: tuple[str, ...]
+
+
+def _build_query_tokens(task: str, context: str) -> _QueryTokens | None:
+    """Tokenize and synonym-expand a task/context pair, or return None if it has no tokens."""
     task_tokens = _extract_normalized_tokens(task)
     context_tokens = _extract_normalized_tokens(context) if context else set()
     combined_tokens = task_tokens | context_tokens
 
     if not combined_tokens:
-        return 0.0
+        return None
+
+    # Only tokens of 3+ chars take part in substring matching; filter them once here
+    # rather than once per tool.
+    return _QueryTokens(
+        enriched=frozenset(_enrich_tokens_with_synonyms(combined_tokens)),
+        partial=tuple(token for token in combined_tokens if len(token) >= 3),
+    )
+
 
-    # Expand with synonyms for better matching
-    enriched_query_tokens = _enrich_tokens_with_synonyms(combined_tokens)
+def _score_tool_for_query(query: _QueryTokens | None, tool: dict[str, Any]) -> float:
+    """Score a single tool against pre-tokenized query tokens."""
+    if query is None:
+        return 0.0
 
     tool_name = (tool.get("name") or "").lower()
     tool_description = (tool.get("description") or "").lower()
@@ -79,13 +95,13 @@ def calculate_tool_relevance_score(task: str, context: str, tool: dict[str, Any]
     gateway_tokens = _extract_normalized_tokens(gateway_slug)
 
     # Weighted scoring: name matches are most important
-    name_exact_score = len(enriched_query_tokens & name_tokens) * 10
-    description_exact_score = len(enriched_query_tokens & description_tokens) * 3
-    gateway_exact_score = len(enriched_query_tokens & gateway_tokens) * 2
+    name_exact_score = len(query.enriched & name_tokens) * 10
+    description_exact_score = len(query.enriched & description_tokens) * 3
+    gateway_exact_score = len(query.enriched & gateway_tokens) * 2
 
     # Partial matches for substring matching
-    name_partial_score = _calculate_substring_match_score(combined_tokens, tool_name) * 5
-    description_partial_score = _calculate_substring_match_score(combined_tokens, tool_description) * 1
+    name_partial_score = _calculate_substring_match_score(query.partial, tool_name) * 5
+    description_partial_score = _calculate_substring_match_score(query.partial, tool_description) * 1
 
     total_score = (
         name_exact_score
@@ -98,6 +114,11 @@ def calculate_tool_relevance_score(task: str, context: str, tool: dict[str, Any]
     return float(total_score)
 
 
+def calculate_tool_relevance_score(task: str, context: str, tool: dict[str, Any]) -> float:
+    """Score a tool's relevance to the task with weighted components."""
+    return _score_tool_for_query(_build_query_tokens(task, context), tool)
+
+
 def select_top_matching_tools(
     tools: list[dict[str, Any]], task: str, context: str, top_n: int = 1
 ) -> list[dict[str, Any]]:
@@ -109,7 +130,8 @@ def select_top_matching_tools(
         "scoring.select_top_matching_tools",
         **{"scoring.strategy": "keyword", "scoring.tools_count": len(tools), "scoring.top_n": top_n},
     ) as span:
-        scored_tools = [(tool, calculate_tool_relevance_score(task, context or "", tool)) for tool in tools]
+        query = _build_query_tokens(task, context or "")
+        scored_tools = [(tool, _score_tool_for_query(query, tool)) for tool in tools]
         scored_tools.sort(key=lambda x: -x[1])
         result = [tool for tool, score in scored_tools if score > 0][:top_n]
         span.set_attribute("scoring.matched_count", len(result))
@@ -161,9 +183,10 @@ def _select_top_matching_tools_hybrid_inner(
 ) -> list[dict[str, Any]]:
     """Inner implementation of hybrid tool selection (called within OTel span)."""
     # Get keyword scores for all tools
+    query = _build_query_tokens(task, context or "")
     keyword_scores = {}
     for tool in tools:
-        keyword_scores[tool.get("name", "")] = calculate_tool_relevance_score(task, context or "", tool)
+        keyword_scores[tool.get("name", "")] = _score_tool_for_query(query, tool)
 
     # Retrieve similar tools from feedback history for the AI prompt
     similar_tools: list[str] = []
@@ -277,9 +300,10 @@ def _select_top_matching_tools_enhanced_inner(
 ) -> list[dict[str, Any]]:
     """Inner implementation of enhanced tool selection (called within OTel span)."""
     # Get keyword scores for all tools
+    query = _build_query_tokens(task, context or "")
     keyword_scores = {}
     for tool in tools:
-        keyword_scores[tool.get("name", "")] = calculate_tool_relevance_score(task, context or "", tool)
+        keyword_scores[tool.get("name", "")] = _score_tool_for_query(query, tool)
 
     # Generate NLP hints if available
     intent_hints = []
@@ -1,27 +1,46 @@
-"""Integration tests for end-to-end tool routing workflows."""
+"""Integration tests for end-to-end tool routing workflows.
+
+Every test builds its own in-memory FeedbackStore and module-level data is immutable,
+so the module is safe to run in parallel: ``pytest -n auto`` is the intended invocation.
+"""
 
 from __future__ import annotations
 
-from pathlib import Path
-from unittest.mock import Mock
+import inspect
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import Any
 
-from tool_router.ai.enhanced_selector import EnhancedAISelector
-from tool_router.ai.feedback import FeedbackStore
-from tool_router.core.config import ToolRouterConfig
+import pytest
 
+from tool_router.ai.feedback import FeedbackEntry, FeedbackStore
 
-class TestToolRoutingWorkflows:
-    """Integration tests for complete tool routing workflows."""
 
-    def test_complete_tool_selection_workflow_with_learning(self, tmp_path: Path) -> None:
-        """Test complete workflow from user request to tool execution with learning."""
-        # Setup components
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
+pytestmark = pytest.mark.integration
+
+# Task strings are built once per module rather than re-formatted inside every test loop.
+_SEARCH_DOCS_TASKS = tuple(f"search for python documentation {i}" for i in range(5))
+_READ_CONFIG_TASKS = tuple(f"read configuration file {i}" for i in range(5))
+_DATASET_TASKS = tuple(f"process large dataset {i}" for i in range(5))
+_UI_V1_OK = tuple(f"generate user interface {i}" for i in range(3))
+_UI_V1_FAIL = tuple(f"generate user interface fail {i}" for i in range(3))
+_UI_V2_OK = tuple(f"generate user interface v2 {i}" for i in range(6))
+_DATA_BATCH_TASKS = tuple(f"process data batch {i}" for i in range(100))
+
+
+class _StubSelector:
+    """Stand-in for EnhancedAISelector that always picks search_web."""
 
-        # Mock AI selector
-        ai_selector = Mock(spec=EnhancedAISelector)
-        ai_selector.select_tool.return_value = {
+    def select_tool(
+        self,
+        task: str,
+        tools: list[dict[str, Any]] | None = None,
+        context: str = "",
+        similar_tools: list[str] | None = None,
+    ) -> dict[str, Any]:
+        return {
             "selected_tool": "search_web",
             "confidence": 0.85,
             "reasoning": "Task matches search pattern",
@@ -30,14 +49,58 @@ class TestToolRoutingWorkflows:
             "boost_applied": 1.2,
         }
 
+
+@dataclass(frozen=True, slots=True)
+class _StubConfig:
+    """Immutable, hashable stand-in for the routing settings the tests consult."""
+
+    enabled_tools: tuple[str, ...]
+    # Read-only view; left out of the hash because mapping proxies are unhashable.
+    tool_preferences: Mapping[str, str] = field(hash=False)
+    confidence_threshold: float
+
+
+@pytest.fixture(scope="module")
+def make_store() -> Callable[[], FeedbackStore]:
+    """Factory for fresh in-memory feedback stores, shared across the module."""
+    return partial(FeedbackStore, persist=False)
+
+
+class TestToolRoutingWorkflows:
+    """Integration tests for complete tool routing workflows."""
+
+    def test_stub_selector_matches_enhanced_selector_contract(self) -> None:
+        """Keep _StubSelector in step with the real selector API it stands in for."""
+        # Imported here so the rest of the module doesn't pull in the AI selector stack.
+        from tool_router.ai.enhanced_selector import EnhancedAISelector
+
+        real = inspect.signature(EnhancedAISelector.select_tool)
+        stub = inspect.signature(_StubSelector.select_tool)
+        assert list(stub.parameters) == list(real.parameters)
+
+    def test_make_store_returns_independent_stores(self, make_store: Callable[[], FeedbackStore]) -> None:
+        """Stores from the shared factory must not share state, or parallel runs could interfere."""
+        first, second = make_store(), make_store()
+        first.record(task=_SEARCH_DOCS_TASKS[0], selected_tool="search_web", success=True)
+
+        assert second.get_all_stats() == {}
+
+    def test_complete_tool_selection_workflow_with_learning(self, make_store: Callable[[], FeedbackStore]) -> None:
+        """Test complete workflow from user request to tool execution with learning."""
+        # Setup components
+        feedback_store = make_store()
+
+        # Stub AI selector
+        ai_selector = _StubSelector()
+
         # Simulate user request and tool selection
         user_request = "search for python documentation"
         selection_result = ai_selector.select_tool(user_request)
 
         # Record multiple successful outcomes for meaningful boost
-        for i in range(5):
+        for task in _SEARCH_DOCS_TASKS:
             feedback_store.record(
-                task=f"search for python documentation {i}",
+                task=task,
                 selected_tool=selection_result["selected_tool"],
                 success=True,
                 confidence=selection_result["confidence"],
@@ -53,15 +116,14 @@ class TestToolRoutingWorkflows:
         boost = feedback_store.get_boost("search_web")
         assert boost >= 1.0
 
-    def test_tool_selection_with_fallback_mechanism(self, tmp_path: Path) -> None:
+    def test_tool_selection_with_fallback_mechanism(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test tool selection with AI failure fallback to feedback store."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
+        feedback_store = make_store()
 
         # Seed feedback store with prior successful selections
-        for i in range(5):
+        for task in _READ_CONFIG_TASKS:
             feedback_store.record(
-                task=f"read configuration file {i}",
+                task=task,
                 selected_tool="file_reader",
                 success=True,
                 confidence=0.8,
@@ -83,10 +145,9 @@ class TestToolRoutingWorkflows:
         assert stats is not None
         assert stats.success_count == 6
 
-    def test_multi_tool_task_coordination(self, tmp_path: Path) -> None:
+    def test_multi_tool_task_coordination(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test coordination between multiple tools for complex tasks."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
+        feedback_store = make_store()
 
         # Simulate complex task requiring multiple tools
         complex_task = "analyze the codebase and create documentation"
@@ -120,28 +181,31 @@ class TestToolRoutingWorkflows:
         assert len(code_stats.task_types) > 0
         assert len(doc_stats.task_types) > 0
 
-    def test_error_recovery_and_retry_logic(self, tmp_path: Path) -> None:
+    def test_error_recovery_and_retry_logic(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test error recovery and retry logic in tool selection."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
-
-        # Record multiple failures for data_processor
-        for i in range(5):
-            feedback_store.record(
-                task=f"process large dataset {i}",
-                selected_tool="data_processor",
-                success=False,
-                confidence=0.3,
-            )
-
-        # Record multiple successes for batch_processor
-        for i in range(5):
-            feedback_store.record(
-                task=f"process large dataset {i}",
-                selected_tool="batch_processor",
-                success=True,
-                confidence=0.9,
-            )
+        feedback_store = make_store()
+
+        # Record multiple failures for data_processor, then successes for batch_processor
+        feedback_store.record_many(
+            [
+                FeedbackEntry(
+                    task=task,
+                    selected_tool="data_processor",
+                    success=False,
+                    confidence=0.3,
+                )
+                for task in _DATASET_TASKS
+            ]
+            + [
+                FeedbackEntry(
+                    task=task,
+                    selected_tool="batch_processor",
+                    success=True,
+                    confidence=0.9,
+                )
+                for task in _DATASET_TASKS
+            ]
+        )
 
         # Verify learning from failure and success
         failed_stats = feedback_store.get_stats("data_processor")
@@ -159,19 +223,21 @@ class TestToolRoutingWorkflows:
         assert failed_boost < 1.0
         assert success_boost > 1.0
 
-    def test_configuration_driven_tool_selection(self, tmp_path: Path) -> None:
+    def test_configuration_driven_tool_selection(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test tool selection driven by configuration settings."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
-
-        # Mock configuration
-        config = Mock(spec=ToolRouterConfig)
-        config.enabled_tools = ["search_web", "file_reader", "code_analyzer"]
-        config.tool_preferences = {
-            "search_operations": "search_web",
-            "file_operations": "file_reader",
-        }
-        config.confidence_threshold = 0.7
+        feedback_store = make_store()
+
+        # Stub configuration
+        config = _StubConfig(
+            ("search_web", "file_reader", "code_analyzer"),
+            MappingProxyType(
+                {
+                    "search_operations": "search_web",
+                    "file_operations": "file_reader",
+                }
+            ),
+            0.7,
+        )
 
         # Simulate configuration-based selection
         task = "search for configuration files"
@@ -190,35 +256,40 @@ class TestToolRoutingWorkflows:
         assert stats is not None
         assert stats.success_count == 1
 
-    def test_adaptive_learning_with_user_feedback(self, tmp_path: Path) -> None:
+    def test_adaptive_learning_with_user_feedback(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test adaptive learning based on explicit user feedback."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
-
-        # Record mixed results for v1 (need 5+ records for boost)
-        for i in range(3):
-            feedback_store.record(
-                task=f"generate user interface {i}",
-                selected_tool="ui_generator_v1",
-                success=True,
-                confidence=0.6,
-            )
-        for i in range(3):
-            feedback_store.record(
-                task=f"generate user interface fail {i}",
-                selected_tool="ui_generator_v1",
-                success=False,
-                confidence=0.4,
-            )
-
-        # Record all successes for v2
-        for i in range(6):
-            feedback_store.record(
-                task=f"generate user interface v2 {i}",
-                selected_tool="ui_generator_v2",
-                success=True,
-                confidence=0.9,
-            )
+        feedback_store = make_store()
+
+        # Record mixed results for v1 (need 5+ records for boost) and all successes for v2
+        feedback_store.record_many(
+            [
+                FeedbackEntry(
+                    task=task,
+                    selected_tool="ui_generator_v1",
+                    success=True,
+                    confidence=0.6,
+                )
+                for task in _UI_V1_OK
+            ]
+            + [
+                FeedbackEntry(
+                    task=task,
+                    selected_tool="ui_generator_v1",
+                    success=False,
+                    confidence=0.4,
+                )
+                for task in _UI_V1_FAIL
+            ]
+            + [
+                FeedbackEntry(
+                    task=task,
+                    selected_tool="ui_generator_v2",
+                    success=True,
+                    confidence=0.9,
+                )
+                for task in _UI_V2_OK
+            ]
+        )
 
         # Verify adaptive learning
         v1_stats = feedback_store.get_stats("ui_generator_v1")
@@ -233,10 +304,9 @@ class TestToolRoutingWorkflows:
 
         assert v2_boost > v1_boost
 
-    def test_cross_task_learning_and_pattern_recognition(self, tmp_path: Path) -> None:
+    def test_cross_task_learning_and_pattern_recognition(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test learning patterns across different but related tasks."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
+        feedback_store = make_store()
 
         # Record related tasks with same tool
         related_tasks = [
@@ -259,19 +329,20 @@ class TestToolRoutingWorkflows:
         similar_tools = feedback_store.similar_task_tools("read database config")
         assert "config_reader" in similar_tools
 
-    def test_performance_optimization_with_caching(self, tmp_path: Path) -> None:
+    def test_performance_optimization_with_caching(self, make_store: Callable[[], FeedbackStore]) -> None:
         """Test performance optimization through intelligent caching."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
+        feedback_store = make_store()
 
         # Record many successful operations to build cache
-        for i in range(100):
-            feedback_store.record(
-                task=f"process data batch {i}",
+        feedback_store.record_many(
+            FeedbackEntry(
+                task=task,
                 selected_tool="batch_processor",
                 success=True,
                 confidence=0.85,
             )
+            for task in _DATA_BATCH_TASKS
+        )
 
         # Verify cache effectiveness
         stats = feedback_store.get_stats("batch_processor")
@@ -283,39 +354,26 @@ class TestToolRoutingWorkflows:
         boost = feedback_store.get_boost("batch_processor")
         assert boost > 1.0
 
-    def test_security_aware_tool_selection(self, tmp_path: Path) -> None:
-        """Test tool selection with security considerations."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
-
-        feedback_store.record(
-            task="execute system command",
-            selected_tool="secure_executor",
-            success=True,
-            confidence=0.9,
-        )
-
-        stats = feedback_store.get_stats("secure_executor")
-        assert stats is not None
-        assert stats.success_count == 1
-
-    def test_tool_selection_with_context_preservation(self, tmp_path: Path) -> None:
-        """Test tool selection while preserving user context."""
-        feedback_file = str(tmp_path / "feedback.json")
-        feedback_store = FeedbackStore(feedback_file)
-
-        # Record task with rich context
-        task = "modify user authentication module"
-        context = "Working on OAuth2 implementation for user login system"
-
-        feedback_store.record(
-            task=task,
-            selected_tool="code_modifier",
-            success=True,
-            confidence=0.8,
-            context=context,
-        )
-
-        stats = feedback_store.get_stats("code_modifier")
+    @pytest.mark.parametrize(
+        ("task", "tool", "context"),
+        [
+            pytest.param("execute system command", "secure_executor", "", id="security_aware"),
+            pytest.param(
+                "modify user authentication module",
+                "code_modifier",
+                "Working on OAuth2 implementation for user login system",
+                id="context_preservation",
+            ),
+        ],
+    )
+    def test_single_record_tool_selection(
+        self, make_store: Callable[[], FeedbackStore], task: str, tool: str, context: str
+    ) -> None:
+        """Test that a single recorded selection is learned, with and without user context."""
+        feedback_store = make_store()
+
+        feedback_store.record(task=task, selected_tool=tool, success=True, confidence=0.9, context=context)
+
+        stats = feedback_store.get_stats(tool)
         assert stats is not None
         assert stats.success_count == 1
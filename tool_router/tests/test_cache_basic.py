@@ -4,7 +4,7 @@ Basic Cache Tests
 Tests for the basic cache functionality that works with the existing implementation.
 """
 
-from unittest.mock import Mock
+import uuid
 
 import pytest
 
@@ -113,33 +113,34 @@ def test_cache_performance_monitoring():
         assert metrics is not None
 
 
+@pytest.fixture(scope="class")
+def manager():
+    """One CacheManager shared per test class; tests create uniquely named caches in it."""
+    return CacheManager()
+
+
 class TestCacheOperations:
     """Test cache operations with mock data."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.manager = CacheManager()
-        self.mock_cache = Mock()
-
-    def test_basic_cache_operations(self):
+    def test_basic_cache_operations(self, manager):
         """Test basic cache operations."""
-        assert hasattr(self.manager, "create_ttl_cache")
-        assert hasattr(self.manager, "get_cache")
-        assert hasattr(self.manager, "clear_cache")
+        assert hasattr(manager, "create_ttl_cache")
+        assert hasattr(manager, "get_cache")
+        assert hasattr(manager, "clear_cache")
 
-    def test_cache_with_expiration(self):
+    def test_cache_with_expiration(self, manager):
         """Test cache operations with expiration."""
-        cache = self.manager.create_ttl_cache("test_ttl", CacheConfig(ttl=3600))
+        cache = manager.create_ttl_cache(f"test_ttl_{uuid.uuid4().hex}", CacheConfig(ttl=3600))
         assert cache is not None
         cache["key1"] = "value1"
         assert cache["key1"] == "value1"
 
-    def test_cache_batch_operations(self):
+    def test_cache_batch_operations(self, manager):
         """Test batch cache operations."""
-        cache = self.manager.create_lru_cache("test_lru", CacheConfig(max_size=100))
+        name = f"test_lru_{uuid.uuid4().hex}"
+        cache = manager.create_lru_cache(name, CacheConfig(max_size=100))
         assert cache is not None
-        for i in range(10):
-            cache[f"key_{i}"] = f"value_{i}"
+        assert manager.bulk_set(name, {f"key_{i}": f"value_{i}" for i in range(10)}) == 10
         assert len(cache) == 10
 
 
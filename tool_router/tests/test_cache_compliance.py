@@ -12,6 +12,7 @@ Comprehensive tests for the cache compliance module including:
 
 import gc
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -80,6 +81,15 @@ class TestGDPRComplianceHandler:
         has_consent = self.gdpr_handler.check_consent(subject_id, "email", "marketing")
         assert has_consent is False
 
+    def test_consent_check_does_not_take_lock(self):
+        """Test consent checks read the index without waiting on writers."""
+        self.gdpr_handler.record_consent("known_user", {"data_types": ["email"], "purposes": ["newsletter"]})
+
+        with self.gdpr_handler._lock:
+            assert self.gdpr_handler.check_consent("known_user", "email", "newsletter") is True
+            assert self.gdpr_handler.check_consent("unknown_user", "email", "newsletter") is False
+            assert self.gdpr_handler.check_consent("known_user", "email", "marketing") is False
+
     def test_consent_withdrawal(self):
         """Test consent withdrawal functionality."""
         consent_data = {
@@ -103,6 +113,57 @@ class TestGDPRComplianceHandler:
 
         assert self.gdpr_handler.check_consent(subject_id, "personal_data", "analytics") is False
 
+    def test_withdrawal_keeps_other_consents_for_same_key(self):
+        """Test withdrawing one consent leaves overlapping consents usable."""
+        consent_data = {"data_types": ["email", "name"], "purposes": ["newsletter"]}
+        subject_id = "overlap_user"
+        first_id = self.gdpr_handler.record_consent(subject_id, consent_data)
+        second_id = self.gdpr_handler.record_consent(subject_id, {"data_types": ["email"], "purposes": ["newsletter"]})
+
+        self.gdpr_handler.withdraw_consent(first_id)
+
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is True
+        assert self.gdpr_handler.check_consent(subject_id, "name", "newsletter") is False
+        with self.gdpr_handler._lock:
+            assert self.gdpr_handler._consent_index[(subject_id, "email", "newsletter")] == (second_id,)
+            assert (subject_id, "name", "newsletter") not in self.gdpr_handler._consent_index
+
+    def test_fresh_ids_unique_across_pool_refills(self, monkeypatch):
+        """Test pooled ID generation keeps IDs unique when the pool is refilled."""
+        monkeypatch.setattr("tool_router.cache.compliance._ID_POOL_SIZE", 2)
+
+        ids = self.gdpr_handler._fresh_ids(5) + self.gdpr_handler._fresh_ids(1)
+
+        assert len(set(ids)) == 6
+        assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
+
+    def test_consent_strings_are_interned(self):
+        """Test equal data type and purpose strings from separate requests share one object."""
+        first_id, second_id = (
+            self.gdpr_handler.record_consent(
+                f"intern_user_{i}", {"data_types": ["".join(["pro", "file"])], "purposes": ["".join(["ad", "s"])]}
+            )
+            for i in range(2)
+        )
+
+        with self.gdpr_handler._lock:
+            first = self.gdpr_handler._consent_records[first_id]
+            second = self.gdpr_handler._consent_records[second_id]
+            assert first.data_types[0] is second.data_types[0]
+            assert first.purposes[0] is second.purposes[0]
+
+    def test_consent_accepts_none_fields(self):
+        """Test None data types, purposes and legal basis are stored rather than rejected."""
+        consent_id = self.gdpr_handler.record_consent(
+            "intern_none_user", {"data_types": None, "purposes": None, "legal_basis": None}
+        )
+
+        with self.gdpr_handler._lock:
+            record = self.gdpr_handler._consent_records[consent_id]
+            assert record.data_types == []
+            assert record.purposes == []
+            assert record.legal_basis is None
+
     def test_consent_expiration_handling(self):
         """Test consent expiration handling."""
         consent_data = {
@@ -119,6 +180,80 @@ class TestGDPRComplianceHandler:
 
         assert self.gdpr_handler.check_consent(subject_id, "test_data", "test_purpose") is False
 
+    def test_expired_consents_drained_from_index(self, monkeypatch):
+        """Test consents past their expiry are evicted from the index on the next check."""
+        monkeypatch.setattr("tool_router.cache.compliance._CONSENT_TTL_DAYS", -1)
+        subject_id = "drain_test_user"
+        consent_id = self.gdpr_handler.record_consent(subject_id, {"data_types": ["email"], "purposes": ["newsletter"]})
+
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is False
+
+        with self.gdpr_handler._lock:
+            assert (subject_id, "email", "newsletter") not in self.gdpr_handler._consent_index
+            assert self.gdpr_handler._expiry_heap == []
+            assert self.gdpr_handler._consent_records[consent_id].granted is True
+
+    def test_extend_consent_reindexes_drained_consent(self, monkeypatch):
+        """Test extending a consent after its expiry was drained makes it valid again."""
+        monkeypatch.setattr("tool_router.cache.compliance._CONSENT_TTL_DAYS", -1)
+        subject_id = "extend_test_user"
+        consent_id = self.gdpr_handler.record_consent(subject_id, {"data_types": ["email"], "purposes": ["newsletter"]})
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is False
+
+        new_expiry = datetime.now(UTC) + timedelta(days=30)
+        assert self.gdpr_handler.extend_consent(consent_id, new_expiry) is True
+
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is True
+        with self.gdpr_handler._lock:
+            assert self.gdpr_handler._consent_index[(subject_id, "email", "newsletter")] == (consent_id,)
+            assert self.gdpr_handler._expiry_heap == [(new_expiry.timestamp(), consent_id)]
+
+    def test_extend_consent_keeps_one_heap_entry_while_indexed(self):
+        """Test extending a live consent does not duplicate its expiry heap entry."""
+        consent_id = self.gdpr_handler.record_consent("extend_live_user", {"data_types": ["a"], "purposes": ["b"]})
+        self.gdpr_handler.extend_consent(consent_id, datetime.now(UTC) + timedelta(days=400))
+
+        with self.gdpr_handler._lock:
+            assert [cid for _, cid in self.gdpr_handler._expiry_heap] == [consent_id]
+
+    def test_extend_consent_accepts_naive_expiry(self, monkeypatch):
+        """Test a naive expiry is read as local time and keeps lock-free checks working."""
+        monkeypatch.setattr("tool_router.cache.compliance._CONSENT_TTL_DAYS", -1)
+        subject_id = "extend_naive_user"
+        consent_id = self.gdpr_handler.record_consent(subject_id, {"data_types": ["email"], "purposes": ["newsletter"]})
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is False
+
+        naive_expiry = datetime.now() + timedelta(days=5)
+        assert self.gdpr_handler.extend_consent(consent_id, naive_expiry) is True
+
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is True
+        expires_at = self.gdpr_handler._consent_records[consent_id].expires_at
+        assert expires_at.tzinfo is UTC
+        assert expires_at.timestamp() == naive_expiry.timestamp()
+
+    def test_extend_consent_rejects_withdrawn_or_unknown(self):
+        """Test withdrawn and unknown consents cannot be extended."""
+        consent_id = self.gdpr_handler.record_consent("extend_withdrawn_user", {"data_types": ["a"], "purposes": ["b"]})
+        self.gdpr_handler.withdraw_consent(consent_id)
+        later = datetime.now(UTC) + timedelta(days=30)
+
+        assert self.gdpr_handler.extend_consent(consent_id, later) is False
+        assert self.gdpr_handler.extend_consent("missing", later) is False
+        assert self.gdpr_handler.check_consent("extend_withdrawn_user", "a", "b") is False
+
+    def test_regranted_consent_visible_after_drain(self, monkeypatch):
+        """Test the lock-free check sees a consent re-granted after the old one was drained."""
+        subject_id = "regrant_test_user"
+        consent_data = {"data_types": ["email"], "purposes": ["newsletter"]}
+        monkeypatch.setattr("tool_router.cache.compliance._CONSENT_TTL_DAYS", -1)
+        self.gdpr_handler.record_consent(subject_id, consent_data)
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is False
+
+        monkeypatch.setattr("tool_router.cache.compliance._CONSENT_TTL_DAYS", 365)
+        self.gdpr_handler.record_consent(subject_id, consent_data)
+
+        assert self.gdpr_handler.check_consent(subject_id, "email", "newsletter") is True
+
     def test_multiple_consent_records(self):
         """Test handling multiple consent records for same subject."""
         subject_id = "multi_consent_user"
@@ -186,6 +321,8 @@ class TestGDPRComplianceHandler:
         user1_requests = self.gdpr_handler.get_data_subject_requests("user1")
         assert len(user1_requests) == 2
         assert all(req.subject_id == "user1" for req in user1_requests)
+        assert [req.description for req in user1_requests] == ["Request 0", "Request 2"]
+        assert self.gdpr_handler.get_data_subject_requests("unknown_user") == []
 
         all_requests = self.gdpr_handler.get_data_subject_requests()
         assert len(all_requests) == 4
@@ -203,8 +340,7 @@ class TestGDPRComplianceHandler:
         assert "audit_logs_created" in result
         assert "processed_at" in result
 
-        processed_at = datetime.fromisoformat(result["processed_at"])
-        assert isinstance(processed_at, datetime)
+        assert isinstance(result["processed_at"], datetime)
 
     def test_consent_with_different_legal_bases(self):
         """Test consent with different legal bases."""
@@ -275,6 +411,19 @@ class TestComplianceReporter:
         assert len(assessment_no_encryption.recommendations) > 0
         assert len(assessment_no_retention.recommendations) > 0
 
+    def test_assessment_tracks_config_changes(self):
+        """Test repeated assessments reflect config mutations and return independent lists."""
+        self.config.encryption_enabled = True
+        first = self.reporter.assess_gdpr_compliance()
+        first.findings.append("caller note")
+
+        self.config.encryption_enabled = False
+        second = self.reporter.assess_gdpr_compliance()
+
+        assert second.score == first.score - 20
+        assert "caller note" not in second.findings
+        assert "WARNING: Data encryption not enabled" in second.findings
+
     def test_compliance_report_generation(self):
         """Test comprehensive compliance report generation."""
         standards = [ComplianceStandard.GDPR]
@@ -306,8 +455,10 @@ class TestComplianceReporter:
 
     def test_assessment_history_tracking(self):
         """Test assessment history tracking."""
+        self.reporter._now = iter(
+            [datetime(2024, 1, 1, tzinfo=UTC), datetime(2024, 1, 1, 0, 0, 1, tzinfo=UTC)]
+        ).__next__
         assessment1 = self.reporter.assess_gdpr_compliance()
-        time.sleep(0.1)
         assessment2 = self.reporter.assess_gdpr_compliance()
 
         history = self.reporter.get_assessment_history(ComplianceStandard.GDPR)
@@ -326,6 +477,19 @@ class TestComplianceManager:
         self.config = CacheConfig()
         self.compliance_manager = ComplianceManager(self.config)
 
+    def test_extended_consent_passes_check_after_drain(self, monkeypatch):
+        """Test a consent extended through the manager after its deadline drained is honoured again."""
+        monkeypatch.setattr("tool_router.cache.compliance._CONSENT_TTL_DAYS", -1)
+        subject_id = "manager_extend_user"
+        consent_id = self.compliance_manager.record_consent(
+            subject_id, {"data_types": ["email"], "purposes": ["marketing"]}
+        )
+        assert self.compliance_manager.check_consent(subject_id, "email", "marketing") is False
+
+        assert self.compliance_manager.extend_consent(consent_id, datetime.now(UTC) + timedelta(days=30)) is True
+
+        assert self.compliance_manager.check_consent(subject_id, "email", "marketing") is True
+
     def test_consent_management_workflow(self):
         """Test complete consent management workflow."""
         subject_id = "workflow_test_user"
@@ -355,6 +519,25 @@ class TestComplianceManager:
         has_consent = self.compliance_manager.check_consent(subject_id, "email", "personalization")
         assert has_consent is False
 
+    def test_batch_consent_recording(self):
+        """Test recording several consents in one call."""
+        subject_id = "batch_test_user"
+        consent_ids = self.compliance_manager.record_consents(
+            subject_id,
+            [
+                {"data_types": ["email"], "purposes": ["newsletter"]},
+                {"data_types": ["name"], "purposes": ["analytics"]},
+            ],
+        )
+
+        assert len(consent_ids) == 2
+        assert self.compliance_manager.check_consent(subject_id, "email", "newsletter") is True
+        assert self.compliance_manager.check_consent(subject_id, "name", "analytics") is True
+        assert self.compliance_manager.get_metrics().total_compliance_checks == 4
+
+        with pytest.raises(ComplianceError):
+            self.compliance_manager.record_consents(subject_id, [{"data_types": ["email"]}, {}])
+
     def test_data_subject_request_management(self):
         """Test data subject request management."""
         requests_data = [
@@ -401,9 +584,9 @@ class TestComplianceManager:
         assert result["subject_id"] == subject_id
         assert "processed_at" in result
 
-        processed_at = datetime.fromisoformat(result["processed_at"])
+        processed_at = result["processed_at"]
         assert isinstance(processed_at, datetime)
-        assert (datetime.now(UTC) - processed_at.replace(tzinfo=UTC)) < timedelta(minutes=1)
+        assert (datetime.now(UTC) - processed_at) < timedelta(minutes=1)
 
     def test_compliance_assessment_integration(self):
         """Test compliance assessment integration."""
@@ -547,7 +730,7 @@ class TestComplianceIntegration:
         rtbf_result = self.compliance_manager.process_right_to_be_forgotten(subject_id)
 
         assert rtbf_result["subject_id"] == subject_id
-        assert "processed_at" in rtbf_result
+        assert isinstance(rtbf_result["processed_at"], datetime)
 
     def test_compliance_assessment_driven_improvements(self):
         """Test compliance assessment-driven improvements."""
@@ -568,62 +751,69 @@ class TestComplianceIntegration:
     def test_multi_user_consent_management(self):
         """Test consent management across multiple users."""
         users = [f"user_{i}" for i in range(10)]
+        # Per-user decisions computed once: even users consent to email, every third to marketing
+        shares_email = [i % 2 == 0 for i in range(10)]
+        allows_marketing = [i % 3 == 0 for i in range(10)]
+
+        consent_ids = self.compliance_manager.record_consents_multi(
+            (
+                user,
+                {
+                    "data_types": ["email", "preferences"] if email else ["name"],
+                    "purposes": ["marketing"] if marketing else ["analytics"],
+                    "legal_basis": "consent",
+                },
+            )
+            for user, email, marketing in zip(users, shares_email, allows_marketing, strict=True)
+        )
+        consent_records = dict(zip(users, consent_ids, strict=True))
 
-        consent_records = {}
-        for user in users:
-            consent_data = {
-                "data_types": (["email", "preferences"] if int(user.split("_")[1]) % 2 == 0 else ["name"]),
-                "purposes": (["marketing"] if int(user.split("_")[1]) % 3 == 0 else ["analytics"]),
-                "legal_basis": "consent",
-            }
-
-            consent_id = self.compliance_manager.record_consent(user, consent_data)
-            consent_records[user] = consent_id
+        for user, email, marketing in zip(users, shares_email, allows_marketing, strict=True):
+            has_consent = self.compliance_manager.check_consent(user, "email", "marketing")
+            assert has_consent is (email and marketing)
 
-        for user in users:
-            user_index = int(user.split("_")[1])
+        for user, email in zip(users, shares_email, strict=True):
+            if email:
+                self.compliance_manager.withdraw_consent(consent_records[user])
 
-            if user_index % 2 == 0:
-                has_email = self.compliance_manager.check_consent(user, "email", "marketing")
-                if user_index % 3 == 0:
-                    assert has_email is True
-            else:
+        for user, email in zip(users, shares_email, strict=True):
+            if email:
                 has_consent = self.compliance_manager.check_consent(user, "email", "marketing")
                 assert has_consent is False
 
-        for i, user in enumerate(users):
-            if i % 2 == 0:
-                self.compliance_manager.withdraw_consent(consent_records[user])
 
-        for i, user in enumerate(users):
-            if i % 2 == 0:
-                has_consent = self.compliance_manager.check_consent(user, "email", "marketing")
-                assert has_consent is False
+@pytest.fixture(scope="class")
+def shared_compliance_manager(request):
+    """Give every test in the class one ComplianceManager instead of rebuilding it per test."""
+    request.cls.config = CacheConfig()
+    request.cls.compliance_manager = ComplianceManager(request.cls.config)
 
 
+@pytest.mark.usefixtures("shared_compliance_manager")
 class TestCompliancePerformance:
-    """Test compliance performance and scalability."""
+    """Test compliance performance and scalability.
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = CacheConfig()
-        self.compliance_manager = ComplianceManager(self.config)
+    These tests use distinct subjects and only assert on their own results, so they
+    can share a manager.
+    """
 
     def test_consent_check_performance(self):
         """Test consent check performance with high volume."""
         num_consent_records = 1000
         subject_id = "perf_test_user"
 
-        consent_ids = []
-        for i in range(num_consent_records):
-            consent_data = {
-                "data_types": [f"data_type_{i}"],
-                "purposes": [f"purpose_{i}"],
-                "legal_basis": "consent",
-            }
-
-            consent_id = self.compliance_manager.record_consent(subject_id, consent_data)
-            consent_ids.append(consent_id)
+        consent_ids = self.compliance_manager.record_consents(
+            subject_id,
+            (
+                {
+                    "data_types": [f"data_type_{i}"],
+                    "purposes": [f"purpose_{i}"],
+                    "legal_basis": "consent",
+                }
+                for i in range(num_consent_records)
+            ),
+        )
+        assert len(set(consent_ids)) == num_consent_records
 
         start_time = time.time()
 
@@ -638,60 +828,32 @@ class TestCompliancePerformance:
 
     def test_concurrent_consent_operations(self):
         """Test concurrent consent operations."""
-        import queue
-        import threading
-
-        results = queue.Queue()
-        errors = queue.Queue()
+        consent_data = {
+            "data_types": ["test_data"],
+            "purposes": ["test_purpose"],
+            "legal_basis": "consent",
+        }
 
         def record_consent(user_id_suffix):
-            try:
-                consent_data = {
-                    "data_types": ["test_data"],
-                    "purposes": ["test_purpose"],
-                    "legal_basis": "consent",
-                }
-
-                consent_id = self.compliance_manager.record_consent(f"concurrent_user_{user_id_suffix}", consent_data)
-                results.put(consent_id)
-            except Exception as e:
-                errors.put(e)
+            return self.compliance_manager.record_consent(f"concurrent_user_{user_id_suffix}", consent_data)
 
         def check_consent(user_id_suffix):
-            try:
-                has_consent = self.compliance_manager.check_consent(
-                    f"concurrent_user_{user_id_suffix}", "test_data", "test_purpose"
-                )
-                results.put(has_consent)
-            except Exception as e:
-                errors.put(e)
-
-        threads = []
-
-        for i in range(10):
-            thread = threading.Thread(target=record_consent, args=(i,))
-            threads.append(thread)
-            thread.start()
-
-        for i in range(10):
-            thread = threading.Thread(target=check_consent, args=(i,))
-            threads.append(thread)
-            thread.start()
-
-        for thread in threads:
-            thread.join()
-
-        assert errors.empty(), f"Errors occurred: {list(errors.queue)}"
-        assert results.qsize() == 20
-
-        consent_ids = []
-        while not results.empty():
-            result = results.get()
-            if isinstance(result, str):
-                consent_ids.append(result)
-                assert len(result) == 32
-            else:
-                assert isinstance(result, bool)
+            return self.compliance_manager.check_consent(
+                f"concurrent_user_{user_id_suffix}", "test_data", "test_purpose"
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(record_consent, i) for i in range(10)]
+            futures += [pool.submit(check_consent, i) for i in range(10)]
+            # result() re-raises any exception from the worker
+            results = [future.result() for future in futures]
+
+        assert len(results) == 20
+        for result in results[:10]:
+            assert isinstance(result, str)
+            assert len(result) == 32
+        for result in results[10:]:
+            assert isinstance(result, bool)
 
     def test_assessment_performance(self):
         """Test compliance assessment performance."""
@@ -730,29 +892,34 @@ class TestCompliancePerformance:
 
     def test_memory_usage_with_large_dataset(self):
         """Test memory usage with large consent datasets."""
-        initial_objects = len(gc.get_objects())
-
         num_records = 5000
         subject_id = "memory_test_user"
 
-        consent_ids = []
-        for i in range(num_records):
-            consent_data = {
-                "data_types": [f"data_type_{i % 100}"],
-                "purposes": [f"purpose_{i % 50}"],
-                "legal_basis": "consent",
-            }
-
-            consent_id = self.compliance_manager.record_consent(subject_id, consent_data)
-            consent_ids.append(consent_id)
-
-        for i in range(num_records):
-            self.compliance_manager.check_consent(subject_id, f"data_type_{i % 100}", f"purpose_{i % 50}")
-
-        final_objects = len(gc.get_objects())
-        object_increase = final_objects - initial_objects
-
-        assert object_increase < num_records * 10
+        # Freeze everything that already exists so the final count only sees new objects
+        gc.collect()
+        gc.freeze()
+        try:
+            self.compliance_manager.record_consents(
+                subject_id,
+                (
+                    {
+                        "data_types": [f"data_type_{i % 100}"],
+                        "purposes": [f"purpose_{i % 50}"],
+                        "legal_basis": "consent",
+                    }
+                    for i in range(num_records)
+                ),
+            )
+
+            for i in range(num_records):
+                self.compliance_manager.check_consent(subject_id, f"data_type_{i % 100}", f"purpose_{i % 50}")
+
+            gc.collect()
+            object_increase = len(gc.get_objects())
+        finally:
+            gc.unfreeze()
+
+        assert object_increase < num_records * 5
 
 
 if __name__ == "__main__":
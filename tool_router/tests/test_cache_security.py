@@ -15,15 +15,26 @@ Test Coverage Goals:
 - Error handling and edge cases
 - Performance testing
 - Security validation
+
+The model patches below are applied at import time, so every xdist worker gets its own
+copy, and the shared managers are scoped to a class. Tests that mutate a shared manager
+restore it afterwards (``isolated_access_state``/``isolated_security_state``), so results
+do not depend on test order.
 """
 
 import os
+import secrets
 
 # Import the cache security modules
 import sys
 import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 from cryptography.fernet import Fernet
@@ -50,6 +61,15 @@ from cache.types import (
 )
 
 
+# Tests that only need some valid key share this one; the key generation and
+# rotation tests still generate their own.
+_TEST_KEY = Fernet.generate_key().decode()
+
+# Reference time for building fresh and stale fixtures. The code under test still
+# reads the real clock, so offsets from this stay well clear of retention boundaries.
+_NOW = datetime.now()
+
+
 class SecuritySettings:
     """Mock security settings for testing."""
 
@@ -61,9 +81,14 @@ class SecuritySettings:
         self.audit_enabled = True
 
 
+_ENCRYPTION_REQUIRED = frozenset({DataClassification.CONFIDENTIAL, DataClassification.SENSITIVE})
+_GDPR_APPLICABLE = _ENCRYPTION_REQUIRED | {DataClassification.INTERNAL}
+
+
 def create_test_config():
     """Create a config with all required attributes for security testing."""
-    config = CacheConfig()
+    # Managers built from this config start with the shared test key already set
+    config = CacheConfig(encryption_key=_TEST_KEY)
     # Add missing attributes required by security.py
     config.security = SecuritySettings()
     config.access_request_expiry_hours = 24
@@ -72,59 +97,33 @@ def create_test_config():
     config.max_audit_entries_per_query = 1000
 
     # Add helper methods
-    def is_encryption_required(classification):
-        return classification in [DataClassification.CONFIDENTIAL, DataClassification.SENSITIVE]
-
-    def is_gdpr_applicable(classification):
-        return classification in [
-            DataClassification.CONFIDENTIAL,
-            DataClassification.SENSITIVE,
-            DataClassification.INTERNAL,
-        ]
-
-    config.is_encryption_required = is_encryption_required
-    config.is_gdpr_applicable = is_gdpr_applicable
+    config.is_encryption_required = _ENCRYPTION_REQUIRED.__contains__
+    config.is_gdpr_applicable = _GDPR_APPLICABLE.__contains__
 
     return config
 
 
-# Monkey-patch CacheEntryMetadata to add data_classification property
-# This works around a bug in security.py that expects data_classification but types.py has classification
-original_cache_entry_init = CacheEntryMetadata.__init__
-
-
-def patched_cache_entry_init(self, *args, **kwargs):
-    original_cache_entry_init(self, *args, **kwargs)
-    # Add data_classification as an alias for classification
-    if hasattr(self, "classification") and not hasattr(self, "data_classification"):
-        self.data_classification = self.classification
-
-
-CacheEntryMetadata.__init__ = patched_cache_entry_init
-
 # Monkey-patch AuditEntry to handle security.py's incompatible field names
 # security.py uses: resource, metadata, data_classification
 # types.py has: resource_id, details, (no data_classification)
 original_audit_entry_init = AuditEntry.__init__
 
 
-def patched_audit_entry_init(self, *args, **kwargs):
-    # Map resource -> resource_id
-    if "resource" in kwargs:
-        kwargs["resource_id"] = kwargs.pop("resource")
+_MISSING = object()
+_AUDIT_RENAMES = (("resource", "resource_id"), ("metadata", "details"))
+_AUDIT_DROPS = ("data_classification",)
 
-    # Map metadata -> details
-    if "metadata" in kwargs:
-        kwargs["details"] = kwargs.pop("metadata")
 
-    # Remove data_classification (not in AuditEntry)
-    kwargs.pop("data_classification", None)
+def patched_audit_entry_init(self, *args, **kwargs):
+    for old, new in _AUDIT_RENAMES:
+        value = kwargs.pop(old, _MISSING)
+        if value is not _MISSING:
+            kwargs[new] = value
+    for key in _AUDIT_DROPS:
+        kwargs.pop(key, None)
 
-    # Generate event_id if not provided
     if "event_id" not in kwargs:
-        import secrets
-
-        kwargs["event_id"] = secrets.token_hex(16)
+        kwargs["event_id"] = secrets.token_hex(8)
 
     original_audit_entry_init(self, *args, **kwargs)
 
@@ -141,30 +140,29 @@ from cache.types import SecurityMetrics
 original_security_metrics_init = SecurityMetrics.__init__
 
 
-def patched_security_metrics_init(self, *args, **kwargs):
-    # Map security.py fields to types.py fields or add them as new attributes
-    enabled_flags = {}
-    for key in [
+_METRICS_EXTRA_FIELDS = frozenset(
+    {
         "encryption_enabled",
         "access_control_enabled",
         "gdpr_enabled",
         "retention_enabled",
         "audit_enabled",
-    ]:
-        if key in kwargs:
-            enabled_flags[key] = kwargs.pop(key)
+        "audit_entries_count",
+        "active_policies",
+        "pending_requests",
+        "approved_requests",
+        "denied_requests",
+    }
+)
+
 
-    counts = {}
-    for key in ["audit_entries_count", "active_policies", "pending_requests", "approved_requests", "denied_requests"]:
-        if key in kwargs:
-            counts[key] = kwargs.pop(key)
+def patched_security_metrics_init(self, *args, **kwargs):
+    # Strip the fields types.py doesn't know and set them as plain attributes afterwards
+    extras = [(key, kwargs.pop(key)) for key in _METRICS_EXTRA_FIELDS & kwargs.keys()]
 
     original_security_metrics_init(self, *args, **kwargs)
 
-    # Add the enabled flags and counts as attributes
-    for key, value in enabled_flags.items():
-        setattr(self, key, value)
-    for key, value in counts.items():
+    for key, value in extras:
         setattr(self, key, value)
 
 
@@ -194,6 +192,138 @@ def delete_user_data_patch(self, user_id: str, data_type: str | None = None) ->
 RetentionPolicyManager.delete_user_data = delete_user_data_patch
 
 
+# create_access_request builds AccessRequest with fields types.py doesn't have, so the
+# access-request tests append this security.py-compatible shape directly
+@dataclass
+class CompatAccessRequest:
+    user_id: str
+    operation: AccessLevel
+    key: str
+    data_classification: DataClassification
+    reason: str
+    expires_at: datetime
+    approved: bool = False
+    approved_by: str | None = None
+    approved_at: datetime | None = None
+    metadata: dict = None
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
+
+    def expired(self):
+        return datetime.now() > self.expires_at
+
+
+class FakeCache:
+    """Dict-backed stand-in for a cache backend that records (operation, key) calls.
+
+    Cheaper than Mock, so the loops below measure the security code rather than call recording.
+    """
+
+    __slots__ = ("calls", "store")
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append(("get", key))
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.calls.append(("set", key))
+        self.store[key] = value
+        return True
+
+    def delete(self, key):
+        self.calls.append(("delete", key))
+        self.store.pop(key, None)
+        return True
+
+
+@pytest.fixture(scope="module")
+def security_config():
+    """Build the security test config once per module; no test mutates it."""
+    return create_test_config()
+
+
+@pytest.fixture(scope="class")
+def shared_encryption(request, security_config):
+    """Share one CacheEncryption per class; every test sets the key it needs."""
+    request.cls.config = security_config
+    request.cls.encryption = CacheEncryption(security_config)
+
+
+@pytest.fixture(scope="class")
+def shared_access_manager(request, security_config):
+    """Share one AccessControlManager per class instead of reloading default policies per test."""
+    request.cls.config = security_config
+    request.cls.access_manager = AccessControlManager(security_config)
+
+
+@contextmanager
+def _preserved_access_state(manager):
+    """Put an access manager's permissions and requests back as they were on exit."""
+    permissions = {user_id: set(levels) for user_id, levels in manager.user_permissions.items()}
+    access_requests = list(manager.access_requests)
+    try:
+        yield
+    finally:
+        manager.user_permissions.clear()
+        manager.user_permissions.update(permissions)
+        manager.access_requests[:] = access_requests
+
+
+@pytest.fixture
+def isolated_access_state(request):
+    """Restore the shared access manager's permissions and requests after each test."""
+    with _preserved_access_state(request.cls.access_manager):
+        yield
+
+
+@pytest.fixture(scope="class")
+def shared_gdpr_manager(request, security_config):
+    """Share one GDPRComplianceManager per class; tests use distinct subjects."""
+    request.cls.config = security_config
+    request.cls.gdpr_manager = GDPRComplianceManager(security_config)
+
+
+@pytest.fixture(scope="class")
+def shared_retention_manager(request, security_config):
+    """Share one RetentionPolicyManager per class instead of rebuilding default rules per test."""
+    request.cls.config = security_config
+    request.cls.retention_manager = RetentionPolicyManager(security_config)
+
+
+@pytest.fixture(scope="class")
+def shared_security_manager(request, security_config):
+    """Share one CacheSecurityManager per class; pair with isolated_security_state."""
+    request.cls.config = security_config
+    request.cls.security_manager = CacheSecurityManager(security_config)
+
+
+@pytest.fixture
+def isolated_security_state(request):
+    """Restore the shared security manager's grants, tracked user data and audit trail after each test."""
+    manager = request.cls.security_manager
+    user_data = {user_id: dict(data) for user_id, data in manager.retention_manager.user_data.items()}
+    audit_trail = list(manager.audit_trail)
+    with _preserved_access_state(manager.access_control):
+        yield
+    manager.retention_manager.user_data.clear()
+    manager.retention_manager.user_data.update(user_data)
+    manager.audit_trail.clear()
+    manager.audit_trail.extend(audit_trail)
+
+
+@pytest.fixture(scope="class")
+def shared_compliance_manager(request, security_config):
+    """Share one ComplianceManager per class; tests use distinct subjects."""
+    request.cls.config = security_config
+    request.cls.compliance_manager = ComplianceManager(security_config)
+
+
 class TestCacheConfig:
     """Test cache configuration management."""
 
@@ -209,6 +339,7 @@ class TestCacheConfig:
         assert config.encryption_key is None
         assert config.audit_max_entries == 10000
         assert config.audit_retention_days == 90
+        assert config.max_audit_entries_per_query == 1000
 
     def test_retention_days_configuration(self):
         """Test retention days configuration."""
@@ -257,14 +388,10 @@ class TestCacheConfig:
             assert config.retention_days[DataClassification.CONFIDENTIAL] == 30
 
 
+@pytest.mark.usefixtures("shared_encryption")
 class TestCacheEncryption:
     """Test cache encryption functionality."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
-        self.encryption = CacheEncryption(self.config)
-
     def test_encryption_key_generation(self):
         """Test encryption key generation."""
         key = self.encryption.generate_key()
@@ -278,10 +405,6 @@ class TestCacheEncryption:
         """Test encryption and decryption roundtrip."""
         test_data = "This is sensitive test data"
 
-        # Generate and set encryption key
-        key = self.encryption.generate_key()
-        self.encryption.set_encryption_key(key)
-
         # Encrypt
         encrypted_data = self.encryption.encrypt(test_data)
 
@@ -296,9 +419,6 @@ class TestCacheEncryption:
 
     def test_encryption_with_different_data_types(self):
         """Test encryption with different data types."""
-        # Generate and set encryption key
-        key = self.encryption.generate_key()
-        self.encryption.set_encryption_key(key)
 
         test_cases = [
             ("Simple string", str),
@@ -306,12 +426,13 @@ class TestCacheEncryption:
             (["list", "of", "items"], list),
         ]
 
-        for test_data, expected_type in test_cases:
-            encrypted_data = self.encryption.encrypt(test_data)
-            decrypted_data = self.encryption.decrypt(encrypted_data)
+        # Encrypt all payloads as one list so the test pays for a single roundtrip
+        payloads = [test_data for test_data, _ in test_cases]
+        decrypted_payloads = self.encryption.decrypt(self.encryption.encrypt(payloads))
 
-            assert decrypted_data == test_data
-            assert type(decrypted_data) == expected_type
+        assert decrypted_payloads == payloads
+        for decrypted_data, (_, expected_type) in zip(decrypted_payloads, test_cases, strict=True):
+            assert isinstance(decrypted_data, expected_type)
 
         # Test bytes separately - it's returned as string after decryption
         bytes_data = b"bytes data"
@@ -323,16 +444,14 @@ class TestCacheEncryption:
         """Test encryption key rotation."""
         test_data = "Test data for key rotation"
 
-        # Set initial key and encrypt
+        # Set initial key
         initial_key = self.encryption.generate_key()
         self.encryption.set_encryption_key(initial_key)
-        encrypted_data1 = self.encryption.encrypt(test_data)
 
         # Rotate key
-        old_key = self.encryption.get_encryption_key()
         new_key = self.encryption.rotate_key()
 
-        assert old_key != new_key
+        assert initial_key != new_key
         assert self.encryption.get_encryption_key() == new_key
 
         # New encryption should work with new key
@@ -345,8 +464,7 @@ class TestCacheEncryption:
 
     def test_encryption_with_custom_key(self):
         """Test encryption with custom key."""
-        custom_key = Fernet.generate_key().decode()
-        config = CacheConfig(encryption_key=custom_key)
+        config = CacheConfig(encryption_key=_TEST_KEY)
         encryption = CacheEncryption(config)
 
         test_data = "Test data with custom key"
@@ -366,15 +484,12 @@ class TestCacheEncryption:
             encryption.encrypt(test_data)
 
         # Set key and verify it works
-        encryption.set_encryption_key(encryption.generate_key())
+        encryption.set_encryption_key(_TEST_KEY)
         encrypted_data = encryption.encrypt(test_data)
         assert encrypted_data is not None
 
     def test_encryption_errors(self):
         """Test encryption error handling."""
-        # Set up encryption key
-        self.encryption.set_encryption_key(self.encryption.generate_key())
-
         # Test invalid encrypted data
         with pytest.raises(EncryptionError):
             self.encryption.decrypt(b"invalid_encrypted_data")
@@ -384,14 +499,10 @@ class TestCacheEncryption:
             self.encryption.decrypt("not_bytes_data")
 
 
+@pytest.mark.usefixtures("shared_access_manager", "isolated_access_state")
 class TestAccessControlManager:
     """Test access control management."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
-        self.access_manager = AccessControlManager(self.config)
-
     def test_basic_access_control(self):
         """Test basic access control functionality."""
         user_id = "test_user"
@@ -415,37 +526,13 @@ class TestAccessControlManager:
         """Test access request denial workflow."""
         # Note: create_access_request has a bug where it uses incompatible AccessRequest fields
         # We test the deny_access_request functionality by manually creating a compatible request
-
-        from dataclasses import dataclass
-
-        @dataclass
-        class TestAccessRequest:
-            user_id: str
-            operation: AccessLevel
-            key: str
-            data_classification: DataClassification
-            reason: str
-            expires_at: datetime
-            approved: bool = False
-            approved_by: str | None = None
-            approved_at: datetime | None = None
-            metadata: dict = None
-
-            def __post_init__(self):
-                if self.metadata is None:
-                    self.metadata = {}
-
-            def expired(self):
-                return datetime.now() > self.expires_at
-
-        # Manually add a request
-        request = TestAccessRequest(
+        request = CompatAccessRequest(
             user_id="user_456",
             operation=AccessLevel.WRITE,
             key="resource_789",
             data_classification=DataClassification.CONFIDENTIAL,
             reason="Need update",
-            expires_at=datetime.now() + timedelta(hours=24),
+            expires_at=_NOW + timedelta(hours=24),
         )
 
         with self.access_manager._lock:
@@ -470,8 +557,7 @@ class TestAccessControlManager:
         assert len(permissions) == 0
 
         # Add permissions
-        self.access_manager.user_permissions[user_id].add(AccessLevel.READ)
-        self.access_manager.user_permissions[user_id].add(AccessLevel.WRITE)
+        self.access_manager.user_permissions[user_id] |= {AccessLevel.READ, AccessLevel.WRITE}
 
         permissions = self.access_manager.get_user_permissions(user_id)
         assert len(permissions) == 2
@@ -504,36 +590,14 @@ class TestAccessControlManager:
 
     def test_access_request_expiration(self):
         """Test access request expiration and cleanup."""
-        from dataclasses import dataclass
-
-        @dataclass
-        class TestAccessRequest:
-            user_id: str
-            operation: AccessLevel
-            key: str
-            data_classification: DataClassification
-            reason: str
-            expires_at: datetime
-            approved: bool = False
-            approved_by: str | None = None
-            approved_at: datetime | None = None
-            metadata: dict = None
-
-            def __post_init__(self):
-                if self.metadata is None:
-                    self.metadata = {}
-
-            def expired(self):
-                return datetime.now() > self.expires_at
-
         # Manually create an expired request
-        request = TestAccessRequest(
+        request = CompatAccessRequest(
             user_id="temp_user",
             operation=AccessLevel.READ,
             key="temp_resource",
             data_classification=DataClassification.PUBLIC,
             reason="Temporary access",
-            expires_at=datetime.now() - timedelta(hours=1),  # Already expired
+            expires_at=_NOW - timedelta(hours=1),  # Already expired
         )
 
         with self.access_manager._lock:
@@ -550,14 +614,10 @@ class TestAccessControlManager:
         assert len(self.access_manager.access_requests) == 0
 
 
+@pytest.mark.usefixtures("shared_gdpr_manager")
 class TestGDPRComplianceManager:
     """Test GDPR compliance management."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
-        self.gdpr_manager = GDPRComplianceManager(self.config)
-
     def test_consent_recording(self):
         """Test consent recording and retrieval."""
         user_id = "subject_123"
@@ -650,14 +710,10 @@ class TestGDPRComplianceManager:
         assert requests[0]["status"] == "pending"
 
 
+@pytest.mark.usefixtures("shared_retention_manager")
 class TestRetentionPolicyManager:
     """Test retention policy management."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
-        self.retention_manager = RetentionPolicyManager(self.config)
-
     def test_default_retention_rules(self):
         """Test default retention rules are created."""
         rules = self.retention_manager.get_rules()
@@ -698,8 +754,8 @@ class TestRetentionPolicyManager:
         metadata = CacheEntryMetadata(
             key="test_key",
             classification=DataClassification.SENSITIVE,
-            created_at=datetime.now() - timedelta(days=100),  # 100 days old
-            last_accessed=datetime.now() - timedelta(days=50),
+            created_at=_NOW - timedelta(days=100),  # 100 days old
+            last_accessed=_NOW - timedelta(days=50),
             access_count=10,
             tags=[],
         )
@@ -714,7 +770,7 @@ class TestRetentionPolicyManager:
         fresh_metadata = CacheEntryMetadata(
             key="test_key_fresh",
             classification=DataClassification.SENSITIVE,
-            created_at=datetime.now() - timedelta(days=10),  # 10 days old
+            created_at=_NOW - timedelta(days=10),  # 10 days old
             access_count=5,
             tags=[],
         )
@@ -729,7 +785,7 @@ class TestRetentionPolicyManager:
         old_metadata = CacheEntryMetadata(
             key="old_key",
             classification=DataClassification.PUBLIC,
-            created_at=datetime.now() - timedelta(days=400),  # Very old
+            created_at=_NOW - timedelta(days=400),  # Very old
             access_count=5,
             tags=[],
         )
@@ -737,7 +793,7 @@ class TestRetentionPolicyManager:
         fresh_metadata = CacheEntryMetadata(
             key="fresh_key",
             classification=DataClassification.PUBLIC,
-            created_at=datetime.now() - timedelta(days=10),  # Fresh
+            created_at=_NOW - timedelta(days=10),  # Fresh
             access_count=3,
             tags=[],
         )
@@ -755,11 +811,12 @@ class TestRetentionPolicyManager:
         """Test cleanup of expired data."""
         # Add some test data
         user_id = "cleanup_user"
-        self.retention_manager.add_user_data(
-            user_id, "old_data", "test", timestamp=datetime.now() - timedelta(days=500)
-        )
-        self.retention_manager.add_user_data(
-            user_id, "fresh_data", "test", timestamp=datetime.now() - timedelta(days=1)
+        self.retention_manager.bulk_add_user_data(
+            user_id,
+            [
+                ("old_data", "test", _NOW - timedelta(days=500)),
+                ("fresh_data", "test", _NOW - timedelta(days=1)),
+            ],
         )
 
         # Run cleanup
@@ -800,18 +857,14 @@ class TestRetentionPolicyManager:
         assert "test_delete_rule" not in rules_after
 
 
+@pytest.mark.usefixtures("shared_security_manager", "isolated_security_state")
 class TestCacheSecurityManager:
     """Test integrated cache security manager."""
 
     def setup_method(self):
         """Setup test environment."""
-        self.config = create_test_config()
-        self.security_manager = CacheSecurityManager(self.config)
-        # Create a mock cache for testing
-        self.mock_cache = Mock()
-        self.mock_cache.get = Mock(return_value=None)
-        self.mock_cache.set = Mock(return_value=True)
-        self.mock_cache.delete = Mock(return_value=True)
+        # Create a fake cache for testing
+        self.cache = FakeCache()
 
     def test_security_components_initialization(self):
         """Test that all security components are properly initialized."""
@@ -819,13 +872,10 @@ class TestCacheSecurityManager:
         assert self.security_manager.access_control is not None
         assert self.security_manager.gdpr_manager is not None
         assert self.security_manager.retention_manager is not None
-        assert isinstance(self.security_manager.audit_trail, list)
+        assert isinstance(self.security_manager.audit_trail, deque)
 
     def test_secure_set_operation(self):
         """Test secure set operation."""
-        # Set encryption key
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
-
         # Grant user permission
         user_id = "test_user"
         self.security_manager.access_control.user_permissions[user_id].add(AccessLevel.WRITE)
@@ -835,32 +885,29 @@ class TestCacheSecurityManager:
         value = "test_value"
         classification = DataClassification.PUBLIC
 
-        result = self.security_manager.secure_set(self.mock_cache, key, value, user_id, classification)
+        result = self.security_manager.secure_set(self.cache, key, value, user_id, classification)
 
         assert result is True
-        self.mock_cache.set.assert_called_once()
+        assert self.cache.calls == [("set", key)]
 
     def test_secure_get_operation(self):
         """Test secure get operation."""
-        # Set encryption key
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
-
         # Grant user permission
         user_id = "test_user"
         self.security_manager.access_control.user_permissions[user_id].add(AccessLevel.READ)
 
-        # Mock cache to return data
+        # Seed the cache with data
         test_data = "cached_value"
-        self.mock_cache.get = Mock(return_value=test_data)
+        self.cache.store["test_key"] = test_data
 
         # Perform secure get
         key = "test_key"
         classification = DataClassification.PUBLIC
 
-        result = self.security_manager.secure_get(self.mock_cache, key, user_id, classification)
+        result = self.security_manager.secure_get(self.cache, key, user_id, classification)
 
         assert result == test_data
-        self.mock_cache.get.assert_called_once_with(key)
+        assert self.cache.calls == [("get", key)]
 
     def test_secure_delete_operation(self):
         """Test secure delete operation."""
@@ -875,10 +922,10 @@ class TestCacheSecurityManager:
         # Perform secure delete
         classification = DataClassification.PUBLIC
 
-        result = self.security_manager.secure_delete(self.mock_cache, key, user_id, classification)
+        result = self.security_manager.secure_delete(self.cache, key, user_id, classification)
 
         assert result is True
-        self.mock_cache.delete.assert_called_once_with(key)
+        assert self.cache.calls == [("delete", key)]
 
     def test_access_denied_operations(self):
         """Test operations without proper access."""
@@ -887,15 +934,15 @@ class TestCacheSecurityManager:
         classification = DataClassification.CONFIDENTIAL
 
         # Try to set without permission
-        result = self.security_manager.secure_set(self.mock_cache, key, "value", user_id, classification)
+        result = self.security_manager.secure_set(self.cache, key, "value", user_id, classification)
         assert result is False
 
         # Try to get without permission
-        result = self.security_manager.secure_get(self.mock_cache, key, user_id, classification)
+        result = self.security_manager.secure_get(self.cache, key, user_id, classification)
         assert result is None
 
         # Try to delete without permission
-        result = self.security_manager.secure_delete(self.mock_cache, key, user_id, classification)
+        result = self.security_manager.secure_delete(self.cache, key, user_id, classification)
         assert result is False
 
     def test_security_metrics(self):
@@ -915,7 +962,7 @@ class TestCacheSecurityManager:
         user_id = "audit_user"
         self.security_manager.access_control.user_permissions[user_id].add(AccessLevel.READ)
 
-        self.security_manager.secure_get(self.mock_cache, "audit_key", user_id, DataClassification.PUBLIC)
+        self.security_manager.secure_get(self.cache, "audit_key", user_id, DataClassification.PUBLIC)
 
         # Check audit trail
         audit_entries = self.security_manager.get_audit_trail()
@@ -929,14 +976,10 @@ class TestCacheSecurityManager:
             assert hasattr(entry, "user_id")
 
 
+@pytest.mark.usefixtures("shared_compliance_manager")
 class TestComplianceManager:
     """Test compliance manager integration."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
-        self.compliance_manager = ComplianceManager(self.config)
-
     def test_consent_management_integration(self):
         """Test consent management through compliance manager."""
         consent_data = {
@@ -1017,9 +1060,10 @@ class TestComplianceManager:
 class TestIntegrationScenarios:
     """Test integration scenarios between components."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
+    @pytest.fixture(autouse=True)
+    def _setup_managers(self, security_config):
+        """Build fresh managers per test on top of the module's shared config."""
+        self.config = security_config
         self.security_manager = CacheSecurityManager(self.config)
         self.compliance_manager = ComplianceManager(self.config)
         self.retention_manager = RetentionPolicyManager(self.config)
@@ -1038,7 +1082,6 @@ class TestIntegrationScenarios:
 
         # Step 2: Encrypt sensitive data
         sensitive_data = "User's personal information"
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
         encrypted_data = self.security_manager.encryption.encrypt(sensitive_data)
 
         # Step 3: Grant access permissions
@@ -1049,7 +1092,7 @@ class TestIntegrationScenarios:
         metadata = CacheEntryMetadata(
             key="user_profile",
             classification=DataClassification.SENSITIVE,
-            created_at=datetime.now(),
+            created_at=_NOW,
         )
 
         # Step 5: Check retention policy
@@ -1095,7 +1138,6 @@ class TestIntegrationScenarios:
         test_data = "Highly confidential business data"
 
         # Encrypt with encryption manager
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
         encrypted_data = self.security_manager.encryption.encrypt(test_data)
         assert encrypted_data is not None
 
@@ -1123,13 +1165,13 @@ class TestIntegrationScenarios:
         sensitive_metadata = CacheEntryMetadata(
             key="sensitive_data",
             classification=DataClassification.SENSITIVE,
-            created_at=datetime.now() - timedelta(days=100),  # Old data
+            created_at=_NOW - timedelta(days=100),  # Old data
         )
 
         public_metadata = CacheEntryMetadata(
             key="public_data",
             classification=DataClassification.PUBLIC,
-            created_at=datetime.now() - timedelta(days=200),  # Very old data
+            created_at=_NOW - timedelta(days=200),  # Very old data
         )
 
         # Check retention for both
@@ -1146,95 +1188,66 @@ class TestIntegrationScenarios:
         fresh_metadata = CacheEntryMetadata(
             key="fresh_data",
             classification=DataClassification.SENSITIVE,
-            created_at=datetime.now() - timedelta(days=10),
+            created_at=_NOW - timedelta(days=10),
         )
 
         fresh_should_retain = self.retention_manager.should_retain(fresh_metadata)
         assert fresh_should_retain is True
 
 
+@pytest.mark.usefixtures("shared_security_manager", "isolated_security_state")
 class TestPerformanceAndScalability:
     """Test performance and scalability aspects."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.config = create_test_config()
-        self.security_manager = CacheSecurityManager(self.config)
-
     def test_encryption_performance(self):
         """Test encryption performance with various data sizes."""
-        # Set encryption key
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
-
         data_sizes = [100, 1000, 10000, 100000]  # bytes
+        test_data = ["x" * size for size in data_sizes]
 
-        for size in data_sizes:
-            test_data = "x" * size
-
-            start_time = time.time()
-            encrypted_data = self.security_manager.encryption.encrypt(test_data)
-            encrypt_time = time.time() - start_time
+        start_time = time.time()
+        encrypted_data = self.security_manager.encryption.encrypt_many(test_data)
+        encrypt_time = time.time() - start_time
 
-            start_time = time.time()
-            decrypted_data = self.security_manager.encryption.decrypt(encrypted_data)
-            decrypt_time = time.time() - start_time
+        start_time = time.time()
+        decrypted_data = [self.security_manager.encryption.decrypt(token) for token in encrypted_data]
+        decrypt_time = time.time() - start_time
 
-            # Performance should be reasonable (adjust thresholds as needed)
-            assert encrypt_time < 1.0  # 1 second max
-            assert decrypt_time < 1.0  # 1 second max
-            assert decrypted_data == test_data
+        # Performance should be reasonable (adjust thresholds as needed)
+        assert encrypt_time < 1.0  # 1 second max
+        assert decrypt_time < 1.0  # 1 second max
+        assert decrypted_data == test_data
 
     def test_concurrent_access_control(self):
         """Test concurrent access control checks."""
-        import threading
+        access_control = self.security_manager.access_control
+        user_ids = [f"user_{i}" for i in range(10)]
 
         # Grant all users READ permission
-        for i in range(10):
-            user_id = f"user_{i}"
-            self.security_manager.access_control.user_permissions[user_id].add(AccessLevel.READ)
-
-        results = []
-        errors = []
+        access_control.grant_many(dict.fromkeys(user_ids, AccessLevel.READ))
 
         def check_access(user_id):
-            try:
-                has_access = self.security_manager.access_control.check_access(
-                    user_id, AccessLevel.READ, "test_resource", DataClassification.PUBLIC
-                )
-                results.append(has_access)
-            except Exception as e:
-                errors.append(e)
-
-        # Create multiple threads
-        threads = []
-        for i in range(10):
-            thread = threading.Thread(target=check_access, args=(f"user_{i}",))
-            threads.append(thread)
-            thread.start()
-
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+            return access_control.check_access(user_id, AccessLevel.READ, "test_resource", DataClassification.PUBLIC)
+
+        # Reuse a fixed pool so the checks, not thread start-up, dominate; worker
+        # exceptions are re-raised by map
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(check_access, user_ids * 100))
 
         # Verify all operations completed
-        assert len(errors) == 0
-        assert len(results) == 10
+        assert len(results) == 1000
         assert all(results)  # All should be granted since we granted permissions
 
     def test_audit_log_scalability(self):
         """Test audit log scalability."""
-        # Set encryption key
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
-
         # Generate many audit entries by performing operations
         user_id = "perf_user"
         self.security_manager.access_control.user_permissions[user_id].add(AccessLevel.READ)
 
-        mock_cache = Mock()
-        mock_cache.get = Mock(return_value=None)
+        cache = FakeCache()
+        secure_get = self.security_manager.secure_get
 
         for i in range(100):
-            self.security_manager.secure_get(mock_cache, f"test_key_{i}", user_id, DataClassification.PUBLIC)
+            secure_get(cache, f"test_key_{i}", user_id, DataClassification.PUBLIC)
 
         # Test retrieval performance
         start_time = time.time()
@@ -1246,32 +1259,27 @@ class TestPerformanceAndScalability:
 
     def test_memory_usage(self):
         """Test memory usage with large datasets."""
-        import gc
-        import sys
-
-        # Set encryption key
-        self.security_manager.encryption.set_encryption_key(self.security_manager.encryption.generate_key())
-
-        # Get initial memory usage
-        initial_objects = len(gc.get_objects()) if "gc" in sys.modules else 0
-
-        # Create and encrypt many items
-        encrypted_items = []
-        for i in range(100):
-            data = "x" * 1000  # 1KB each
-            encrypted_data = self.security_manager.encryption.encrypt(data)
-            encrypted_items.append(encrypted_data)
-
-        # Decrypt all items
-        for encrypted_data in encrypted_items:
-            self.security_manager.encryption.decrypt(encrypted_data)
-
-        # Memory usage should be reasonable
-        final_objects = len(gc.get_objects()) if "gc" in sys.modules else 0
-        object_increase = final_objects - initial_objects
-
-        # Should not create excessive objects (adjust threshold as needed)
-        assert object_increase < 10000
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+
+            # Create and encrypt many items
+            encrypted_items = []
+            for i in range(100):
+                data = "x" * 1000  # 1KB each
+                encrypted_data = self.security_manager.encryption.encrypt(data)
+                encrypted_items.append(encrypted_data)
+
+            # Decrypt all items
+            for encrypted_data in encrypted_items:
+                self.security_manager.encryption.decrypt(encrypted_data)
+
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        # Retained memory should stay well under 2MB for ~100KB of plaintext
+        assert after - before < 2_000_000
 
 
 if __name__ == "__main__":
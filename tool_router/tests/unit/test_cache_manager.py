@@ -138,6 +138,24 @@ def test_reset_all_metrics() -> None:
     assert metrics["misses"] == 0
 
 
+# ── bulk_set ──────────────────────────────────────────────────────────────────
+
+
+def test_bulk_set_writes_all_entries() -> None:
+    cm = CacheManager()
+    cache = cm.create_lru_cache("bulk_test", CacheConfig(max_size=5))
+    written = cm.bulk_set("bulk_test", {f"key_{i}": i for i in range(8)})
+    assert written == 8
+    # LRU bound still applies: only the most recent entries survive
+    assert len(cache) == 5
+    assert cache["key_7"] == 7
+
+
+def test_bulk_set_unknown_cache_returns_zero() -> None:
+    cm = CacheManager()
+    assert cm.bulk_set("missing_cache", {"k": "v"}) == 0
+
+
 # ── clear caches ─────────────────────────────────────────────────────────────
 
 
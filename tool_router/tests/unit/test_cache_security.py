@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import json
+import math
 import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
 from cryptography.fernet import Fernet
@@ -13,10 +17,12 @@ from tool_router.cache.security import (
     CacheSecurityManager,
     GDPRComplianceManager,
     RetentionPolicyManager,
+    _NoncePool,
 )
 from tool_router.cache.types import (
     AccessLevel,
     CacheConfig,
+    CacheEntryMetadata,
     DataClassification,
     EncryptionError,
     SecurityPolicy,
@@ -95,6 +101,92 @@ def test_encryption_with_config_key() -> None:
     assert enc.get_encryption_key() == key
 
 
+def test_encryption_json_roundtrip_keeps_stdlib_semantics() -> None:
+    enc = CacheEncryption()
+    enc.set_encryption_key(_valid_key())
+    assert enc.decrypt(enc.encrypt({"b": [1, 2], "a": {"n": None}})) == {"a": {"n": None}, "b": [1, 2]}
+    assert enc.decrypt(enc.encrypt({1: "x"})) == {"1": "x"}
+    assert enc.decrypt(enc.encrypt({"n": 2**70})) == {"n": 2**70}
+    assert math.isnan(enc.decrypt(enc.encrypt({"x": float("nan")}))["x"])
+    assert enc.decrypt(enc.encrypt([float("inf")])) == [float("inf")]
+    assert enc.decrypt(enc.encrypt("not json")) == "not json"
+
+
+def test_encryption_reads_stdlib_json_payloads() -> None:
+    key = _valid_key()
+    enc = CacheEncryption()
+    enc.set_encryption_key(key)
+    payload = json.dumps({"big": 2**70, "inf": float("-inf")}, sort_keys=True).encode()
+    assert enc.decrypt(Fernet(key).encrypt(payload)) == {"big": 2**70, "inf": float("-inf")}
+
+
+def test_encryption_reads_legacy_fernet_tokens() -> None:
+    key = _valid_key()
+    enc = CacheEncryption()
+    enc.set_encryption_key(key)
+
+    assert enc.decrypt(Fernet(key).encrypt(b'{"a": 1}')) == {"a": 1}
+    with pytest.raises(EncryptionError, match="Invalid token"):
+        enc.decrypt(Fernet(_valid_key()).encrypt(b"payload"))
+
+
+def test_encryption_emits_gcm_tokens() -> None:
+    key = _valid_key()
+    enc = CacheEncryption()
+    enc.set_encryption_key(key)
+
+    token = enc.encrypt("payload")
+    assert token[:1] == b"\x01"
+    assert len(token) == 1 + 12 + len(b"payload") + 16
+
+    other = CacheEncryption()
+    other.set_encryption_key(key)
+    assert other.decrypt(token) == "payload"
+
+    tampered = token[:-1] + bytes([token[-1] ^ 1])
+    with pytest.raises(EncryptionError, match="Invalid token"):
+        enc.decrypt(tampered)
+    other.set_encryption_key(_valid_key())
+    with pytest.raises(EncryptionError, match="Invalid token"):
+        other.decrypt(token)
+
+
+def test_encryption_encrypt_many_emits_gcm_tokens() -> None:
+    enc = CacheEncryption()
+    enc.set_encryption_key(_valid_key())
+
+    tokens = enc.encrypt_many(["text", {"a": 1}, None, b"raw", b""])
+
+    assert tokens[2] is None
+    assert len({t[1:13] for t in tokens if t is not None}) == 4  # distinct nonces
+    assert [enc.decrypt(t) for t in tokens if t is not None] == ["text", {"a": 1}, "raw", ""]
+
+
+def test_encryption_nonces_stay_unique_across_pool_refills(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tool_router.cache.security._NONCE_POOL_SIZE", 3)
+    monkeypatch.setattr("tool_router.cache.security._nonces", _NoncePool())
+    enc = CacheEncryption()
+    enc.set_encryption_key(_valid_key())
+
+    tokens = [enc.encrypt("x") for _ in range(4)] + enc.encrypt_many(["y"] * 5)
+
+    assert len({t[1:13] for t in tokens}) == 9
+    assert all(enc.decrypt(t) in {"x", "y"} for t in tokens)
+
+
+def test_nonce_pool_reset_discards_buffered_nonces() -> None:
+    pool = _NoncePool()
+    first = pool.take(1)
+    pool.reset()
+    assert pool.take(1) != first
+    assert pool._pos == 12
+
+
+def test_encryption_encrypt_many_without_key() -> None:
+    with pytest.raises(EncryptionError, match="Encryption key not set"):
+        CacheEncryption().encrypt_many(["x"])
+
+
 # ── AccessControlManager ─────────────────────────────────────────────────────
 
 
@@ -169,6 +261,14 @@ def test_acm_get_user_permissions_returns_set() -> None:
     assert isinstance(perms, set)
 
 
+def test_acm_grant_many_adds_levels() -> None:
+    acm = AccessControlManager()
+    acm.user_permissions["u0"].add(AccessLevel.WRITE)
+    acm.grant_many({"u0": AccessLevel.READ, "u1": AccessLevel.READ})
+    assert acm.get_user_permissions("u0") == {AccessLevel.READ, AccessLevel.WRITE}
+    assert acm.get_user_permissions("u1") == {AccessLevel.READ}
+
+
 def test_acm_revoke_user_access() -> None:
     acm = AccessControlManager()
     result = acm.revoke_user_access("some_user")
@@ -210,6 +310,21 @@ def test_acm_cleanup_expired_requests() -> None:
     assert isinstance(count, int)
 
 
+def test_acm_cleanup_expired_requests_keeps_live_in_place() -> None:
+    acm = AccessControlManager()
+    now = datetime.now()
+    live_a = SimpleNamespace(expires_at=now + timedelta(hours=1))
+    stale = SimpleNamespace(expires_at=now - timedelta(hours=1))
+    live_b = SimpleNamespace(expires_at=now + timedelta(hours=2))
+    requests = acm.access_requests
+    requests.extend([live_a, stale, live_b])
+
+    assert acm.cleanup_expired_requests() == 1
+    assert acm.access_requests is requests
+    assert requests == [live_a, live_b]
+    assert acm.cleanup_expired_requests() == 0
+
+
 # ── GDPRComplianceManager ─────────────────────────────────────────────────────
 
 
@@ -348,6 +463,36 @@ def test_retention_manager_list_rules() -> None:
     assert isinstance(rules, dict)
 
 
+def test_retention_manager_expired_entries_match_should_retain() -> None:
+    rpm = RetentionPolicyManager()
+    for rule in rpm.retention_rules.values():
+        if rule["data_classification"] == DataClassification.INTERNAL:
+            rule["enabled"] = False
+    old = datetime.now() - timedelta(days=400)
+    entries = [
+        CacheEntryMetadata(key=f"{c.value}-{age}", classification=c, created_at=created)
+        for c in DataClassification
+        for age, created in (("old", old), ("new", datetime.now()))
+    ]
+
+    expired = rpm.get_expired_entries(entries)
+
+    assert expired == [e for e in entries if not rpm.should_retain(e)]
+    assert {e.key for e in expired} == {
+        f"{c.value}-old" for c in DataClassification if c is not DataClassification.INTERNAL
+    }
+
+
+def test_retention_manager_bulk_add_user_data() -> None:
+    rpm = RetentionPolicyManager()
+    stamp = datetime.now() - timedelta(days=30)
+    rpm.add_user_data("u1", "existing", "keep", timestamp=stamp)
+    rpm.bulk_add_user_data("u1", [("profile", {"n": 1}, stamp), ("prefs", "dark", None)])
+    assert set(rpm.user_data["u1"]) == {"existing", "profile", "prefs"}
+    assert rpm.user_data["u1"]["profile"] == {"data": {"n": 1}, "timestamp": stamp}
+    assert rpm.user_data["u1"]["prefs"]["timestamp"] > stamp
+
+
 # ── CacheSecurityManager (facade) ────────────────────────────────────────────
 
 
@@ -374,3 +519,53 @@ def test_cache_security_manager_has_gdpr() -> None:
 def test_cache_security_manager_has_retention() -> None:
     csm = CacheSecurityManager()
     assert hasattr(csm, "retention_manager")
+
+
+def test_cache_security_manager_audit_trail_is_bounded() -> None:
+    cfg = CacheConfig()
+    cfg.max_audit_entries_per_query = 3
+    csm = CacheSecurityManager(cfg)
+    csm.audit_trail.extend(SimpleNamespace(user_id=f"u{i}", event_type="read") for i in range(5))
+    assert [e.user_id for e in csm.get_audit_trail()] == ["u2", "u3", "u4"]
+    assert CacheSecurityManager().audit_trail.maxlen == 1000
+
+
+def test_cache_security_manager_audit_cap_fixed_at_construction() -> None:
+    cfg = CacheConfig()
+    csm = CacheSecurityManager(cfg)
+    cfg.max_audit_entries_per_query = 3
+    assert csm.audit_trail.maxlen == 1000
+
+
+def test_cache_config_rejects_non_positive_audit_cap() -> None:
+    with pytest.raises(ValueError, match="max_audit_entries_per_query"):
+        CacheConfig(max_audit_entries_per_query=0).validate()
+
+
+def test_cache_security_manager_audit_trail_filters_keep_latest_in_order() -> None:
+    csm = CacheSecurityManager()
+    csm.audit_trail.extend(
+        SimpleNamespace(user_id=f"u{i % 2}", event_type="read" if i % 3 else "write", seq=i) for i in range(12)
+    )
+    assert [e.seq for e in csm.get_audit_trail(user_id="u0")] == [0, 2, 4, 6, 8, 10]
+    assert [e.seq for e in csm.get_audit_trail(user_id="u0", event_type="read", limit=2)] == [8, 10]
+    assert [e.seq for e in csm.get_audit_trail(event_type="write", limit=10)] == [0, 3, 6, 9]
+    assert [e.seq for e in csm.get_audit_trail(limit=3)] == [9, 10, 11]
+
+
+def test_cache_security_manager_public_fast_path_skips_pipeline() -> None:
+    cfg = CacheConfig()
+    cfg.security = SimpleNamespace(access_control_enabled=False, audit_enabled=False)
+    cfg.is_encryption_required = lambda classification: False
+    csm = CacheSecurityManager(cfg)
+    cache = {"k": "v"}
+    assert csm.secure_get(cache, "k", "anyone", DataClassification.PUBLIC) == "v"
+    assert len(csm.audit_trail) == 0
+
+
+def test_cache_security_manager_public_reads_still_checked_with_access_control() -> None:
+    cfg = CacheConfig()
+    cfg.security = SimpleNamespace(access_control_enabled=True, audit_enabled=False)
+    cfg.is_encryption_required = lambda classification: False
+    csm = CacheSecurityManager(cfg)
+    assert csm.secure_get({"k": "v"}, "k", "stranger", DataClassification.PUBLIC) is None
@@ -59,6 +59,13 @@ def test_access_level_count() -> None:
     assert len(AccessLevel) == 4
 
 
+def test_security_enums_hash_by_identity() -> None:
+    for member in (*AccessLevel, *DataClassification):
+        assert hash(member) == object.__hash__(member)
+    assert AccessLevel("read") in {AccessLevel.READ}
+    assert {DataClassification.PUBLIC: 1}[DataClassification("public")] == 1
+
+
 # ── ComplianceStandard enum ───────────────────────────────────────────────────
 
 
@@ -166,6 +173,13 @@ def test_cache_metrics_custom() -> None:
     assert m.misses == 5
 
 
+def test_cache_metrics_is_slotted() -> None:
+    m = CacheMetrics()
+    assert not hasattr(m, "__dict__")
+    m.hits += 1
+    assert m.hits == 1
+
+
 # ── CacheEntryMetadata ────────────────────────────────────────────────────────
 
 
@@ -200,6 +214,14 @@ def test_cache_entry_metadata_full() -> None:
     assert meta.access_count == 5
 
 
+def test_cache_entry_metadata_data_classification_alias() -> None:
+    meta = CacheEntryMetadata(key="k", classification=DataClassification.PUBLIC, created_at=time.time())
+    assert meta.data_classification is DataClassification.PUBLIC
+    meta.data_classification = DataClassification.SENSITIVE
+    assert meta.classification is DataClassification.SENSITIVE
+    assert not hasattr(meta, "__dict__")
+
+
 # ── AuditEntry ────────────────────────────────────────────────────────────────
 
 
@@ -232,6 +254,11 @@ def test_audit_entry_full() -> None:
     assert entry.outcome == "success"
 
 
+def test_audit_entry_uses_slots() -> None:
+    entry = AuditEntry(event_id="evt-3", timestamp=time.time(), event_type="read")
+    assert not hasattr(entry, "__dict__")
+
+
 # ── AccessRequest ─────────────────────────────────────────────────────────────
 
 
@@ -284,6 +311,13 @@ def test_consent_record_withdrawn_at_no_expires() -> None:
     assert c.expired() is False
 
 
+def test_consent_record_is_slotted() -> None:
+    c = ConsentRecord(consent_id="c-6")
+    assert not hasattr(c, "__dict__")
+    c.granted = False
+    assert c.granted is False
+
+
 # ── SecurityPolicy ─────────────────────────────────────────────────────────────
 
 
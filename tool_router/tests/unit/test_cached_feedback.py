@@ -14,6 +14,7 @@ from tool_router.ai.cached_feedback import (
     TaskPattern,
     ToolStats,
 )
+from tool_router.ai.feedback import FeedbackStore as JournaledFeedbackStore
 
 
 class TestFeedbackEntry:
@@ -143,6 +144,16 @@ class TestCachedFeedbackStore:
         assert store._stats_cache.maxsize == 1000
         assert store._pattern_cache.maxsize == 1000
 
+    def test_default_file_not_shared_with_journaled_store(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(CachedFeedbackStore, "_load", lambda self: None)
+        monkeypatch.setattr(JournaledFeedbackStore, "_load", lambda self: None)
+        monkeypatch.setenv("ROUTER_FEEDBACK_FILE", str(tmp_path / "journaled.json"))
+        monkeypatch.delenv("ROUTER_CACHED_FEEDBACK_FILE", raising=False)
+
+        assert CachedFeedbackStore()._file != JournaledFeedbackStore()._file
+        monkeypatch.delenv("ROUTER_FEEDBACK_FILE")
+        assert CachedFeedbackStore()._file != JournaledFeedbackStore()._file
+
     def test_initialization_custom(self, tmp_path: Path):
         custom_file = tmp_path / "custom_feedback.json"
         store = CachedFeedbackStore(feedback_file=str(custom_file), cache_ttl=1800, cache_size=500)
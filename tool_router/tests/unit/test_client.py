@@ -12,6 +12,7 @@ from tool_router.gateway.client import (
     GatewayClient,
     HTTPGatewayClient,
     SecurityMetadata,
+    _build_tools_call_body,
     call_tool,
     get_tools,
 )
@@ -442,6 +443,14 @@ class TestGatewayClientCoverageGaps:
             }
         }
 
+    def test_build_tools_call_body_matches_json_dumps(self) -> None:
+        params = {"name": "tööl", "arguments": {"nested": [1, 2.5, None, True], "q": 'a "quoted" value'}}
+
+        body = _build_tools_call_body(params)
+
+        assert isinstance(body, bytes)
+        assert json.loads(body) == {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": params}
+
 
 def test_get_tools_raises_when_gateway_jwt_unset() -> None:
     with patch.dict("os.environ", {}, clear=True):
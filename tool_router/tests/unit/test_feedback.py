@@ -1,9 +1,13 @@
 """Tests for the FeedbackStore context learning mechanism."""
 
+import json
+from dataclasses import asdict
 from pathlib import Path
 from unittest.mock import patch
 
-from tool_router.ai.feedback import FeedbackStore
+import pytest
+
+from tool_router.ai.feedback import FeedbackEntry, FeedbackStore
 
 
 class TestFeedbackStore:
@@ -73,6 +77,19 @@ class TestFeedbackStore:
         assert "bad_tool" not in similar
         assert "good_tool" in similar
 
+    def test_similar_task_tools_cache_invalidated_on_record(self, tmp_path: Path) -> None:
+        store = FeedbackStore(str(tmp_path / "fb.json"))
+        store.record("search the web for news", "search_web", success=True)
+        assert store.similar_task_tools("search the web") == ["search_web"]
+
+        with patch.object(store, "_compute_similar_task_tools", wraps=store._compute_similar_task_tools) as compute:
+            assert store.similar_task_tools("the web search") == ["search_web"]
+            compute.assert_not_called()
+
+            store.record("search the web", "web_search", success=True)
+            assert store.similar_task_tools("search the web") == ["web_search", "search_web"]
+            compute.assert_called_once()
+
     def test_similar_task_tools_empty_history(self, tmp_path: Path) -> None:
         store = FeedbackStore(str(tmp_path / "fb.json"))
         assert store.similar_task_tools("search the web") == []
@@ -98,6 +115,179 @@ class TestFeedbackStore:
         assert stats.success_count == 2
         assert stats.failure_count == 1
 
+    def test_record_many_persists_once(self, tmp_path: Path) -> None:
+        fb_path = str(tmp_path / "fb.json")
+        store = FeedbackStore(fb_path)
+        entries = [
+            FeedbackEntry(task=f"read file {i}", selected_tool="file_reader", success=i % 2 == 0) for i in range(4)
+        ]
+        with patch.object(store, "_persist", wraps=store._persist) as mock_persist:
+            store.record_many(entries)
+        assert mock_persist.call_count == 1
+
+        stats = FeedbackStore(fb_path).get_stats("file_reader")
+        assert stats is not None
+        assert stats.success_count == 2
+        assert stats.failure_count == 2
+        assert entries[0].task_type == "file_operations"
+
+    def test_record_many_empty_does_not_persist(self, tmp_path: Path) -> None:
+        store = FeedbackStore(str(tmp_path / "fb.json"))
+        with patch.object(store, "_persist") as mock_persist:
+            store.record_many([])
+        mock_persist.assert_not_called()
+
+    def test_persist_disabled_keeps_store_in_memory(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        fb_path.write_text('{"entries": [], "stats": {"search_web": {"tool_name": "search_web", "success_count": 7}}}')
+        store = FeedbackStore(str(fb_path), persist=False)
+        assert store.get_all_stats() == {}
+
+        store.record("search the web", "search_web", success=True)
+        store.record_many([FeedbackEntry(task="search again", selected_tool="search_web", success=True)])
+
+        assert store.get_stats("search_web").success_count == 2
+        assert FeedbackStore(str(fb_path)).get_stats("search_web").success_count == 7
+
+    def test_avg_confidence_continues_after_reload(self, tmp_path: Path) -> None:
+        fb_path = str(tmp_path / "fb.json")
+        store1 = FeedbackStore(fb_path)
+        store1.record("task", "mytool", success=True, confidence=0.2)
+        store1.record("task", "mytool", success=True, confidence=0.4)
+
+        store2 = FeedbackStore(fb_path)
+        store2.record("task", "mytool", success=True, confidence=0.9)
+
+        assert store2.get_stats("mytool").avg_confidence == 0.5
+
+    def test_avg_confidence_only_covers_retained_entries(self, tmp_path: Path) -> None:
+        store = FeedbackStore(str(tmp_path / "fb.json"), persist=False)
+        store.record("task", "tool_a", success=True, confidence=0.0)
+        store.record_many(
+            FeedbackEntry(task=f"task {i}", selected_tool="tool_b", success=True, confidence=0.5) for i in range(1000)
+        )
+        store.record("task", "tool_a", success=True, confidence=1.0)
+
+        assert store.get_stats("tool_a").avg_confidence == 1.0
+        store.record_many(
+            FeedbackEntry(task="task", selected_tool="tool_b", success=True, confidence=0.85) for _ in range(100)
+        )
+        assert store.get_stats("tool_b").avg_confidence == pytest.approx(0.535)
+
+    def test_recent_success_rate_uses_last_fifty_outcomes(self, tmp_path: Path) -> None:
+        store = FeedbackStore(str(tmp_path / "fb.json"), persist=False)
+        store.record_many(FeedbackEntry(task=f"task {i}", selected_tool="mytool", success=False) for i in range(50))
+        store.record_many(FeedbackEntry(task=f"task {i}", selected_tool="mytool", success=True) for i in range(25))
+        assert store.get_stats("mytool").recent_success_rate == 0.5
+
+    def test_pattern_and_intent_rates_follow_retained_entries(self, tmp_path: Path) -> None:
+        store = FeedbackStore(str(tmp_path / "fb.json"), persist=False)
+        store.record_many(
+            FeedbackEntry(task="read the file", selected_tool="reader", success=False) for _ in range(1000)
+        )
+        assert store._patterns["file_operations"].preferred_tools["reader"] == 0.0
+
+        # Once the failures age out of the retained window they no longer weigh on the rates
+        store.record_many(
+            FeedbackEntry(task="read the file", selected_tool="reader", success=True) for _ in range(1001)
+        )
+        assert store._patterns["file_operations"].preferred_tools["reader"] == 1.0
+        assert store.get_intent_boost("reader", "read") == pytest.approx(1.2)
+
+    def test_persistence_roundtrip_without_orjson(self, tmp_path: Path) -> None:
+        fb_path = str(tmp_path / "fb.json")
+        with patch("tool_router.ai.feedback.ORJSON_AVAILABLE", False):
+            FeedbackStore(fb_path).record("search the web", "search_web", success=True)
+            stats = FeedbackStore(fb_path).get_stats("search_web")
+        assert stats is not None
+        assert stats.success_count == 1
+        assert FeedbackStore(fb_path).get_stats("search_web").success_count == 1
+
+    def test_record_appends_to_journal_without_rewriting_snapshot(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        store = FeedbackStore(str(fb_path))
+        store.record("search the web", "search_web", success=True)
+        store.record_many(
+            [FeedbackEntry(task=f"read file {i}", selected_tool="file_reader", success=True) for i in range(2)]
+        )
+
+        assert not fb_path.exists()
+        header, *lines = (tmp_path / "fb.json.log").read_bytes().splitlines()
+        assert "journal_id" in json.loads(header)
+        assert len(lines) == 3
+
+    def test_compact_folds_journal_into_snapshot(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        store = FeedbackStore(str(fb_path))
+        store.record("search the web", "search_web", success=True)
+        store.compact()
+        store.record("search the web", "search_web", success=False)
+
+        assert len(json.loads(fb_path.read_text())["entries"]) == 1
+        assert len((tmp_path / "fb.json.log").read_bytes().splitlines()) == 2
+        stats = FeedbackStore(str(fb_path)).get_stats("search_web")
+        assert stats.success_count == 1
+        assert stats.failure_count == 1
+
+    def test_journal_compacts_when_full(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        store = FeedbackStore(str(fb_path))
+        store.record_many(FeedbackEntry(task=f"task {i}", selected_tool="mytool", success=True) for i in range(1000))
+
+        assert not (tmp_path / "fb.json.log").exists()
+        assert len(json.loads(fb_path.read_text())["entries"]) == 1000
+
+    def test_journal_left_by_interrupted_compact_is_not_replayed(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        journal_path = tmp_path / "fb.json.log"
+        store = FeedbackStore(str(fb_path))
+        store.record("search the web", "search_web", success=True)
+        journal = journal_path.read_bytes()
+        store.compact()
+        # Crash between the snapshot replace and the journal unlink
+        journal_path.write_bytes(journal)
+
+        reloaded = FeedbackStore(str(fb_path))
+        assert reloaded.get_stats("search_web").success_count == 1
+        assert len(reloaded._entries) == 1
+        assert not journal_path.exists()
+
+    def test_new_journal_after_compact_is_replayed(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        store = FeedbackStore(str(fb_path))
+        store.record("search the web", "search_web", success=True)
+        store.compact()
+        store.record("search again", "search_web", success=True)
+
+        reloaded = FeedbackStore(str(fb_path))
+        assert reloaded.get_stats("search_web").success_count == 2
+        reloaded.record("search once more", "search_web", success=True)
+        reloaded.compact()
+        assert FeedbackStore(str(fb_path)).get_stats("search_web").success_count == 3
+
+    def test_journal_without_header_is_replayed_and_stamped(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        journal_path = tmp_path / "fb.json.log"
+        entry = FeedbackEntry(task="search the web", selected_tool="search_web", success=True)
+        journal_path.write_text(json.dumps(asdict(entry)) + "\n")
+
+        store = FeedbackStore(str(fb_path))
+        assert store.get_stats("search_web").success_count == 1
+        assert "journal_id" in json.loads(journal_path.read_bytes().splitlines()[0])
+        store.record("search again", "search_web", success=True)
+        assert FeedbackStore(str(fb_path)).get_stats("search_web").success_count == 2
+
+    def test_torn_journal_line_is_skipped(self, tmp_path: Path) -> None:
+        fb_path = tmp_path / "fb.json"
+        FeedbackStore(str(fb_path)).record("search the web", "search_web", success=True)
+        with (tmp_path / "fb.json.log").open("ab") as journal:
+            journal.write(b'{"task": "search ag')
+
+        store = FeedbackStore(str(fb_path))
+        assert store.get_stats("search_web").success_count == 1
+        store.record("search again", "search_web", success=True)
+        assert FeedbackStore(str(fb_path)).get_stats("search_web").success_count == 2
+
     def test_max_entries_trimming(self, tmp_path: Path) -> None:
         store = FeedbackStore(str(tmp_path / "fb.json"))
         store._persist = lambda: None
@@ -284,6 +284,17 @@ class TestContextLoggerAdapter:
         assert kwargs["extra"]["user_id"] == "123"
         assert kwargs["extra"]["request_id"] == "abc"
 
+    def test_context_logger_adapter_process_leaves_caller_extra_untouched(self) -> None:
+        """Test ContextLoggerAdapter process does not mutate the caller's extra dict."""
+        logger = MagicMock()
+        adapter = ContextLoggerAdapter(logger, {"user_id": "123"})
+        call_extra = {"existing": "value", "user_id": "override"}
+
+        _, kwargs = adapter.process("Test message", {"extra": call_extra})
+
+        assert call_extra == {"existing": "value", "user_id": "override"}
+        assert kwargs["extra"] == {"existing": "value", "user_id": "123"}
+
 
 class TestLogContext:
     """Test LogContext class."""
@@ -363,6 +363,12 @@ class TestTimingContext:
         assert context.metrics is collector
         assert context.start_time == 0.0
 
+    def test_timing_context_uses_slots(self) -> None:
+        """Test TimingContext instances carry no per-instance __dict__."""
+        context = TimingContext("test_metric", MetricsCollector())
+
+        assert not hasattr(context, "__dict__")
+
     def test_timing_context_initialization_default_metrics(self) -> None:
         """Test TimingContext initialization with default metrics."""
         collector = MetricsCollector()